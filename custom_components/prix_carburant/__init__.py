@@ -1,9 +1,17 @@
 """Prix Carburant integration."""
 
+import asyncio
+import cProfile
 import logging
+import pstats
+import time
+import tracemalloc
 from datetime import timedelta
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+import voluptuous as vol
+
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -19,31 +27,69 @@ from homeassistant.core import (
     SupportsResponse,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTR_ADDRESS,
     ATTR_CITY,
     ATTR_POSTAL_CODE,
     ATTR_PRICE,
+    CONF_ADAPTIVE_POLLING,
     CONF_API_SSL_CHECK,
     CONF_DISPLAY_ENTITY_PICTURES,
     CONF_MANUAL_STATIONS,
     CONF_MAX_KM,
+    CONF_REFRESH_TIERS,
+    CONF_SNAPSHOT_MODE,
     CONF_STATIONS,
+    CONF_STATISTICS_AREA,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     PLATFORMS,
+    SIGNAL_UPDATE_ENTITIES,
+    STATISTICS_AREAS,
 )
-from .tools import PrixCarburantTool
+from .tools import PrixCarburantTool, StationsNameCache, parse_refresh_tiers
+from .view import async_setup_logo_view
 
 _LOGGER = logging.getLogger(__name__)
 
+PROFILE_TOP_ENTRIES = 10
+# decimals of the coordinates of entities sharing a location (about 10 m)
+BATCH_LOCATION_DECIMALS = 4
+# stations per fuel of a batch search, one API page in every mode
+BATCH_MAX_STATIONS = 100
+BATCH_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_ids,
+        vol.Required("fuel"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required("distance"): vol.Coerce(float),
+        vol.Optional("limit", default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=BATCH_MAX_STATIONS)
+        ),
+    }
+)
+# station names known by config entries, kept across reloads
+DATA_STATIONS_NAME_CACHE = f"{DOMAIN}_stations_name_cache"
+# and stored with their validators, kept across restarts
+DATA_STATIONS_NAME_STORE = f"{DOMAIN}_stations_name_store"
+STATIONS_NAME_STORAGE_KEY = f"{DOMAIN}.stations_name"
+STATIONS_NAME_STORAGE_VERSION = 1
+# price update hours learned by the adaptive polling, per config entry
+POLLING_SCHEDULE_STORAGE_KEY = f"{DOMAIN}.polling_schedule"
+POLLING_SCHEDULE_STORAGE_VERSION = 1
+POLLING_SCHEDULE_SAVE_DELAY = 60
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_logo_view(hass)
 
     config: dict = entry.data | entry.options
 
@@ -54,98 +100,260 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         60,
         config.get(CONF_API_SSL_CHECK, True),
         websession,
+        config.get(CONF_SNAPSHOT_MODE, False),
+        names_cache=await _async_get_names_cache(hass),
     )
-    await tool.async_initialize()
+    # setup phases are traced in one debug log record and in diagnostics
+    with tool.metrics.timeline("async_setup_entry"):
+        with tool.metrics.span("async_initialize"):
+            await tool.async_initialize()
 
-    display_entity_pictures = config.get(CONF_DISPLAY_ENTITY_PICTURES, True)
-    update_interval = int(config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        display_entity_pictures = config.get(CONF_DISPLAY_ENTITY_PICTURES, True)
+        _set_refresh_tiers(tool, config)
+        polling_store = _get_polling_schedule_store(hass, entry)
+        tool.polling_schedule.restore(await polling_store.async_load() or {})
 
-    # yaml configuration
-    if CONF_STATIONS in config:
-        _LOGGER.info("Init stations data from yaml list")
-        await tool.init_stations_from_list(
-            stations_ids=config[CONF_STATIONS],
-            latitude=hass.config.latitude,
-            longitude=hass.config.longitude,
+        # yaml configuration
+        if CONF_STATIONS in config:
+            _LOGGER.info("Init stations data from yaml list")
+            with tool.metrics.span("stations_list"):
+                await tool.init_stations_from_list(
+                    stations_ids=config[CONF_STATIONS],
+                    latitude=hass.config.latitude,
+                    longitude=hass.config.longitude,
+                )
+        # ui configuration
+        else:
+            _LOGGER.info(
+                "Init stations list near Home-Assistant location (%s km around %s %s)",
+                config[CONF_MAX_KM],
+                hass.config.latitude,
+                hass.config.longitude,
+            )
+            with tool.metrics.span("discovery"):
+                await tool.init_stations_from_location(
+                    latitude=hass.config.latitude,
+                    longitude=hass.config.longitude,
+                    distance=config[CONF_MAX_KM],
+                )
+            _LOGGER.info("%s stations found", str(len(tool.stations)))
+
+            # Add manual stations if any
+            if config.get(CONF_MANUAL_STATIONS):
+                _LOGGER.info(
+                    "Adding %s manual stations", len(config[CONF_MANUAL_STATIONS])
+                )
+                with tool.metrics.span("manual_stations"):
+                    await tool.add_manual_stations(
+                        manual_station_ids=config[CONF_MANUAL_STATIONS],
+                        latitude=hass.config.latitude,
+                        longitude=hass.config.longitude,
+                    )
+
+        entry_data: dict = {
+            "tool": tool,
+            "options": {
+                CONF_DISPLAY_ENTITY_PICTURES: display_entity_pictures,
+            },
+            # configuration applied to the tool and entities
+            "config": config,
+        }
+
+        async def async_update_data() -> dict:
+            """Fetch data from API."""
+            _LOGGER.info("Update stations prices")
+            await tool.update_stations_prices()
+            if (
+                area := entry_data["config"].get(CONF_STATISTICS_AREA)
+            ) in STATISTICS_AREAS:
+                await tool.update_area_statistics(area)
+            polling_store.async_delay_save(
+                tool.polling_schedule.as_stored, POLLING_SCHEDULE_SAVE_DELAY
+            )
+            # the next refresh is scheduled with the interval set here
+            coordinator.update_interval = _get_update_interval(
+                tool, entry_data["config"]
+            )
+            return tool.stations
+
+        coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_method=async_update_data,
+            update_interval=_get_update_interval(tool, config),
         )
-    # ui configuration
-    else:
-        _LOGGER.info(
-            "Init stations list near Home-Assistant location (%s km around %s %s)",
-            config[CONF_MAX_KM],
-            hass.config.latitude,
-            hass.config.longitude,
+        entry_data["coordinator"] = coordinator
+
+        with tool.metrics.span("first_refresh"):
+            await coordinator.async_config_entry_first_refresh()
+
+        hass.data[DOMAIN][entry.entry_id] = entry_data
+
+        with tool.metrics.span("forward_platforms"):
+            await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # names are served by the local index until the remote sources are loaded
+    entry.async_create_background_task(
+        hass,
+        _async_refresh_station_names(hass, tool, coordinator),
+        f"{DOMAIN} station names refresh",
+    )
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+    _register_services(hass, tool, coordinator)
+    return True
+
+
+async def _async_get_names_cache(hass: HomeAssistant) -> StationsNameCache:
+    """Return the station names cache, restored from storage on first use."""
+    if (names_cache := hass.data.get(DATA_STATIONS_NAME_CACHE)) is None:
+        store: Store[dict] = Store(
+            hass, STATIONS_NAME_STORAGE_VERSION, STATIONS_NAME_STORAGE_KEY
         )
-        await tool.init_stations_from_location(
-            latitude=hass.config.latitude,
-            longitude=hass.config.longitude,
-            distance=config[CONF_MAX_KM],
+        names_cache = hass.data.setdefault(
+            DATA_STATIONS_NAME_CACHE, StationsNameCache()
         )
-        _LOGGER.info("%s stations found", str(len(tool.stations)))
-
-        # Add manual stations if any
-        if config.get(CONF_MANUAL_STATIONS):
-            _LOGGER.info("Adding %s manual stations", len(config[CONF_MANUAL_STATIONS]))
-            await tool.add_manual_stations(
-                manual_station_ids=config[CONF_MANUAL_STATIONS],
-                latitude=hass.config.latitude,
-                longitude=hass.config.longitude,
-            )
+        hass.data[DATA_STATIONS_NAME_STORE] = store
+        names_cache.restore(await store.async_load() or {})
+    return names_cache
 
-    async def async_update_data() -> dict:
-        """Fetch data from API."""
-        _LOGGER.info("Update stations prices")
-        await tool.update_stations_prices()
-        return tool.stations
 
-    coordinator = DataUpdateCoordinator(
+def _get_polling_schedule_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict]:
+    """Return the store of the polling schedule of a config entry."""
+    return Store(
         hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=timedelta(hours=update_interval),
+        POLLING_SCHEDULE_STORAGE_VERSION,
+        f"{POLLING_SCHEDULE_STORAGE_KEY}.{entry.entry_id}",
     )
 
-    await coordinator.async_config_entry_first_refresh()
 
-    hass.data[DOMAIN][entry.entry_id] = {
-        "tool": tool,
-        "coordinator": coordinator,
-        "options": {
-            CONF_DISPLAY_ENTITY_PICTURES: display_entity_pictures,
-        },
+async def _async_refresh_station_names(
+    hass: HomeAssistant, tool: PrixCarburantTool, coordinator: DataUpdateCoordinator
+) -> None:
+    """Load remote station names, then update the entities with them."""
+    if await tool.async_refresh_station_names():
+        store: Store[dict] = hass.data[DATA_STATIONS_NAME_STORE]
+        await store.async_save(hass.data[DATA_STATIONS_NAME_CACHE].as_dict())
+    coordinator.async_update_listeners()
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Apply configuration changes in place instead of reloading the entry.
+
+    Station names are kept, and only the stations added, manually or by a
+    larger distance, are requested. Entities are added and removed by the
+    platforms on the SIGNAL_UPDATE_ENTITIES signal.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    previous_config: dict = entry_data["config"]
+    config: dict = entry.data | entry.options
+    changed = {
+        key
+        for key in previous_config.keys() | config.keys()
+        if previous_config.get(key) != config.get(key)
     }
+    if not changed:
+        return
+    entry_data["config"] = config
+    _LOGGER.debug("Apply configuration changes: %s", ", ".join(sorted(changed)))
+    tool: PrixCarburantTool = entry_data["tool"]
+    coordinator: DataUpdateCoordinator = entry_data["coordinator"]
+
+    if changed & {CONF_SCAN_INTERVAL, CONF_REFRESH_TIERS}:
+        _set_refresh_tiers(tool, config)
+    interval_changed = bool(
+        changed & {CONF_SCAN_INTERVAL, CONF_ADAPTIVE_POLLING, CONF_REFRESH_TIERS}
+    )
+    if interval_changed:
+        coordinator.update_interval = _get_update_interval(tool, config)
+    if changed & {CONF_API_SSL_CHECK, CONF_SNAPSHOT_MODE}:
+        tool.set_request_options(
+            api_ssl_check=config.get(CONF_API_SSL_CHECK, True),
+            snapshot_mode=config.get(CONF_SNAPSHOT_MODE, False),
+        )
+    entry_data["options"][CONF_DISPLAY_ENTITY_PICTURES] = config.get(
+        CONF_DISPLAY_ENTITY_PICTURES, True
+    )
+
+    # stations of a yaml configuration are fixed
+    stations_changed = CONF_STATIONS not in config and await _async_update_stations(
+        hass, tool, previous_config, config
+    )
+    if (
+        CONF_STATISTICS_AREA in changed
+        and (area := config.get(CONF_STATISTICS_AREA)) in STATISTICS_AREAS
+    ):
+        await tool.update_area_statistics(area)
+    # setting the data also schedules the next refresh with the new interval
+    if stations_changed or interval_changed:
+        coordinator.async_set_updated_data(tool.stations)
+    else:
+        coordinator.async_update_listeners()
+    async_dispatcher_send(hass, f"{SIGNAL_UPDATE_ENTITIES}_{entry.entry_id}")
+
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+def _set_refresh_tiers(tool: PrixCarburantTool, config: dict) -> None:
+    """Set the refresh cadence of stations by distance."""
+    tool.set_refresh_tiers(
+        parse_refresh_tiers(config.get(CONF_REFRESH_TIERS, "")),
+        int(config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)),
+    )
+
+
+def _get_update_interval(tool: PrixCarburantTool, config: dict) -> timedelta:
+    """Return the delay until the next prices update, of the most frequent tier."""
+    interval = timedelta(hours=tool.refresh_cadence)
+    if config.get(CONF_ADAPTIVE_POLLING, False):
+        return tool.polling_schedule.get_next_interval(dt_util.now(), interval)
+    return interval
+
+
+async def _async_update_stations(
+    hass: HomeAssistant, tool: PrixCarburantTool, previous_config: dict, config: dict
+) -> bool:
+    """Update stations for a new distance or manual stations, return if changed."""
+    changed = False
+    if previous_config.get(CONF_MAX_KM) != config[CONF_MAX_KM]:
+        await tool.update_discovery_distance(config[CONF_MAX_KM])
+        changed = True
+
+    previous_manual_stations = set(previous_config.get(CONF_MANUAL_STATIONS) or [])
+    manual_stations: list[int] = config.get(CONF_MANUAL_STATIONS) or []
+    if previous_manual_stations == set(manual_stations):
+        return changed
+    tool.remove_manual_stations(list(previous_manual_stations - set(manual_stations)))
+    if new_station_ids := [
+        station_id for station_id in manual_stations if station_id not in tool.stations
+    ]:
+        stations_data, _missing_ids = await tool.fetch_stations_by_ids(
+            new_station_ids,
+            latitude=hass.config.latitude,
+            longitude=hass.config.longitude,
+        )
+        await tool.add_stations(stations_data)
+    return True
+
+
+def _register_services(
+    hass: HomeAssistant, tool: PrixCarburantTool, coordinator: DataUpdateCoordinator
+) -> None:
+    """Register the integration services."""
 
     async def find_nearest_stations(call: ServiceCall) -> ServiceResponse:
         """Search in the range and return the matching items."""
         fuel = call.data["fuel"]
         distance = call.data["distance"]
-        entity_id = call.data["entity_id"]
-        entity = hass.states.get(entity_id)
-        if not entity:
-            msg = "The entity specified was not found"
-            raise HomeAssistantError(msg)
-        if "longitude" not in entity.attributes or "latitude" not in entity.attributes:
-            msg = f"No coordinate attributes found for the entity {entity_id}"
-            raise HomeAssistantError(msg)
+        latitude, longitude = _get_entity_location(hass, call.data["entity_id"])
         stations = await tool.find_nearest_station(
-            longitude=float(entity.attributes["longitude"]),
-            latitude=float(entity.attributes["latitude"]),
+            longitude=longitude,
+            latitude=latitude,
             fuel=fuel,
             distance=distance,
         )
         return {
             "stations": [
-                {
-                    "name": station_data[ATTR_NAME],
-                    "price": station_data.get(ATTR_PRICE),
-                    "address": f"{station_data[ATTR_ADDRESS]}, {station_data[ATTR_POSTAL_CODE]} {station_data[ATTR_CITY]}",
-                    "latitude": station_data[ATTR_LATITUDE],
-                    "longitude": station_data[ATTR_LONGITUDE],
-                }
-                for station_data in stations.values()
+                _format_station(station_data) for station_data in stations.values()
             ],
         }
 
@@ -155,9 +363,184 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         find_nearest_stations,
         supports_response=SupportsResponse.ONLY,
     )
-    return True
+
+    async def find_nearest_stations_batch(call: ServiceCall) -> ServiceResponse:
+        """Search the cheapest stations of several fuels around several entities."""
+        fuels: list[str] = call.data["fuel"]
+        distance = call.data["distance"]
+        limit: int = call.data["limit"]
+        # entities at the same place share the stations of their location
+        entities_by_location: dict[tuple[float, float], list[str]] = {}
+        for entity_id in call.data["entity_id"]:
+            latitude, longitude = _get_entity_location(hass, entity_id)
+            entities_by_location.setdefault(
+                (
+                    round(latitude, BATCH_LOCATION_DECIMALS),
+                    round(longitude, BATCH_LOCATION_DECIMALS),
+                ),
+                [],
+            ).append(entity_id)
+
+        results = await asyncio.gather(
+            *(
+                tool.find_cheapest_stations_by_fuel(
+                    longitude=longitude,
+                    latitude=latitude,
+                    fuels=fuels,
+                    distance=distance,
+                    limit=limit,
+                )
+                for latitude, longitude in entities_by_location
+            )
+        )
+        return {
+            "entities": {
+                entity_id: {
+                    fuel: [
+                        _format_station(station_data)
+                        for station_data in stations.values()
+                    ]
+                    for fuel, stations in stations_by_fuel.items()
+                }
+                for entity_ids, stations_by_fuel in zip(
+                    entities_by_location.values(), results, strict=True
+                )
+                for entity_id in entity_ids
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "find_nearest_stations_batch",
+        find_nearest_stations_batch,
+        schema=BATCH_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def profile_refresh(call: ServiceCall) -> ServiceResponse:
+        """Run a prices refresh under cProfile and tracemalloc."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            msg = f"Cannot start profiler: {err}"
+            raise HomeAssistantError(msg) from err
+        # tracing starts once the profiler runs, so both are always stopped below
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            snapshot_before = await hass.async_add_executor_job(
+                tracemalloc.take_snapshot
+            )
+            start = time.perf_counter()
+            if call.data.get("include_initialize", False):
+                await tool.async_initialize()
+                await _async_refresh_station_names(hass, tool, coordinator)
+            # profile a refresh of every station, whatever its distance tier
+            tool.expire_refresh_tiers()
+            await tool.update_stations_prices()
+            duration = time.perf_counter() - start
+        finally:
+            profiler.disable()
+            snapshot_after = await hass.async_add_executor_job(
+                tracemalloc.take_snapshot
+            )
+            if not was_tracing:
+                tracemalloc.stop()
+
+        return await hass.async_add_executor_job(
+            _write_profile_reports,
+            Path(hass.config.path()),
+            profiler,
+            snapshot_before,
+            snapshot_after,
+            duration,
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile_refresh",
+        profile_refresh,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _get_entity_location(hass: HomeAssistant, entity_id: str) -> tuple[float, float]:
+    """Return the latitude and longitude attributes of an entity."""
+    entity = hass.states.get(entity_id)
+    if not entity:
+        msg = f"The entity {entity_id} was not found"
+        raise HomeAssistantError(msg)
+    if "longitude" not in entity.attributes or "latitude" not in entity.attributes:
+        msg = f"No coordinate attributes found for the entity {entity_id}"
+        raise HomeAssistantError(msg)
+    return float(entity.attributes["latitude"]), float(entity.attributes["longitude"])
+
+
+def _format_station(station_data: dict) -> dict:
+    """Return a station of a service response."""
+    return {
+        "name": station_data[ATTR_NAME],
+        "price": station_data.get(ATTR_PRICE),
+        "address": f"{station_data[ATTR_ADDRESS]}, {station_data[ATTR_POSTAL_CODE]} {station_data[ATTR_CITY]}",
+        "latitude": station_data[ATTR_LATITUDE],
+        "longitude": station_data[ATTR_LONGITUDE],
+    }
+
+
+def _write_profile_reports(
+    config_dir: Path,
+    profiler: cProfile.Profile,
+    snapshot_before: tracemalloc.Snapshot,
+    snapshot_after: tracemalloc.Snapshot,
+    duration: float,
+) -> dict:
+    """Write profile and allocations reports, return a summary."""
+    timestamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    profile_file = config_dir / f"{DOMAIN}_profile_{timestamp}.prof"
+    allocations_file = config_dir / f"{DOMAIN}_allocations_{timestamp}.txt"
+
+    profiler.dump_stats(profile_file)
+    stats_profile = pstats.Stats(profiler).get_stats_profile()
+    top_functions = sorted(
+        stats_profile.func_profiles.items(),
+        key=lambda item: item[1].cumtime,
+        reverse=True,
+    )[:PROFILE_TOP_ENTRIES]
+
+    allocations = snapshot_after.compare_to(snapshot_before, "lineno")
+    with allocations_file.open("w", encoding="UTF-8") as file:
+        file.writelines(f"{statistic}\n" for statistic in allocations)
+
+    return {
+        "duration": round(duration, 3),
+        "profile_file": str(profile_file),
+        "allocations_file": str(allocations_file),
+        "top_functions": [
+            {
+                "function": f"{function.file_name}:{function.line_number}({name})",
+                "calls": function.ncalls,
+                "cumulative_time": round(function.cumtime, 4),
+            }
+            for name, function in top_functions
+        ],
+        "top_allocations": [
+            {
+                "location": str(statistic.traceback),
+                "size_diff": statistic.size_diff,
+                "count_diff": statistic.count_diff,
+            }
+            for statistic in allocations[:PROFILE_TOP_ENTRIES]
+        ],
+    }
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored polling schedule of a removed config entry."""
+    await _get_polling_schedule_store(hass, entry).async_remove()
@@ -13,7 +13,10 @@ if TYPE_CHECKING:
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+    from .tools import PrixCarburantTool
+
 from .const import DOMAIN
+from .entity import get_integration_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,8 +27,13 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the platform from config_entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
     async_add_entities(
-        [RefreshPrixCarburantButton(hass.data[DOMAIN][entry.entry_id]["coordinator"])],
+        [
+            RefreshPrixCarburantButton(
+                entry_data["coordinator"], entry_data["tool"], entry.entry_id
+            )
+        ],
         update_before_add=True,
     )
 
@@ -33,15 +41,24 @@ async def async_setup_entry(
 class RefreshPrixCarburantButton(ButtonEntity):
     """Representation of a refresh button."""
 
-    def __init__(self, coordinator: DataUpdateCoordinator) -> None:
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        tool: PrixCarburantTool,
+        entry_id: str,
+    ) -> None:
         """Initialize the button."""
         self.coordinator = coordinator
+        self._tool = tool
         self._attr_device_class = ButtonDeviceClass.UPDATE
         self._attr_name = "Prix Carburant - Refresh prices"
         self._attr_icon = "mdi:refresh-circle"
         self._attr_unique_id = f"{DOMAIN}_refresh_button"
+        self._attr_device_info = get_integration_device_info(entry_id)
 
     async def async_press(self) -> None:
         """Press the button."""
         _LOGGER.debug("Price refresh asked from button")
+        # every station is refreshed, whatever its distance tier
+        self._tool.expire_refresh_tiers()
         await self.coordinator.async_refresh()
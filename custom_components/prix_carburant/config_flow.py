@@ -2,45 +2,70 @@
 
 from __future__ import annotations
 
+import re
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
 import voluptuous as vol
-from aiohttp import ClientError
 from homeassistant.config_entries import (
     ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
     OptionsFlow,
 )
-from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.const import ATTR_NAME, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import selector
 
 from .const import (
+    ATTR_BRAND,
+    ATTR_CITY,
+    ATTR_POSTAL_CODE,
+    CONF_ADAPTIVE_POLLING,
     CONF_API_SSL_CHECK,
     CONF_DISPLAY_ENTITY_PICTURES,
     CONF_FUELS,
     CONF_MANUAL_STATIONS,
     CONF_MAX_KM,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_PINNED_STATIONS,
+    CONF_REFRESH_TIERS,
+    CONF_SNAPSHOT_MODE,
+    CONF_STATION_TABLE,
     CONF_STATIONS,
+    CONF_STATISTICS_AREA,
     DEFAULT_MAX_KM,
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     FUELS,
+    STATISTICS_AREA_NONE,
+    STATISTICS_AREAS,
 )
 from .tools import (
     PrixCarburantTool,
     PrixCarburantToolCannotConnectError,
     PrixCarburantToolRequestError,
+    parse_refresh_tiers,
 )
 
+# manual station IDs can be separated by commas, semicolons, spaces or lines
+_STATION_IDS_SEPARATORS = re.compile(r"[\s,;]+")
+_SEARCH_RESULTS_LIMIT = 20
+
+
+def _get_search_result_label(station_id: str, fields: dict) -> str:
+    """Return the label of a station in the search results."""
+    city = " ".join(
+        str(fields[key]) for key in (ATTR_POSTAL_CODE, ATTR_CITY) if fields.get(key)
+    )
+    details = " - ".join(detail for detail in (fields.get(ATTR_BRAND), city) if detail)
+    name = fields.get(ATTR_NAME) or station_id
+    return f"{name} ({details}, {station_id})" if details else f"{name} ({station_id})"
+
 
 def _build_schema(data: Mapping[str, Any], options: Mapping[str, Any]) -> vol.Schema:
     """Build schema according to config/options."""
@@ -116,6 +141,7 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
     def __init__(self) -> None:
         """Initialize options flow."""
         self._stations_to_remove: list[str] = []
+        self._search_results: dict[str, str] = {}
 
     def _get_manual_stations(self) -> list[int]:
         """Get manual stations list from config entry data/options."""
@@ -139,8 +165,10 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
             menu_options=[
                 "general_options",
                 "fuels_select",
+                "search_station",
                 "add_station",
                 "delete_stations",
+                "pin_stations",
             ],
         )
 
@@ -151,16 +179,22 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Merge with existing options
-            new_options = dict(self.config_entry.options)
-            new_options.update(user_input)
+            try:
+                parse_refresh_tiers(user_input.get(CONF_REFRESH_TIERS, ""))
+            except ValueError:
+                errors[CONF_REFRESH_TIERS] = "invalid_refresh_tiers"
+            else:
+                # Merge with existing options
+                new_options = dict(self.config_entry.options)
+                new_options.update(user_input)
 
-            self.hass.async_create_task(
-                self.hass.config_entries.async_reload(self.config_entry.entry_id)
-            )
-            return self.async_create_entry(title="", data=new_options)
+                return self.async_create_entry(title="", data=new_options)
 
-        config = dict(self.config_entry.data) | dict(self.config_entry.options)
+        config = (
+            dict(self.config_entry.data)
+            | dict(self.config_entry.options)
+            | (user_input or {})
+        )
 
         schema = vol.Schema(
             {
@@ -180,6 +214,36 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
                     CONF_MAX_KM,
                     default=config.get(CONF_MAX_KM, DEFAULT_MAX_KM),
                 ): vol.All(int, vol.Range(min=1)),
+                vol.Required(
+                    CONF_STATION_TABLE,
+                    default=config.get(CONF_STATION_TABLE, False),
+                ): bool,
+                vol.Required(
+                    CONF_PERFORMANCE_SENSORS,
+                    default=config.get(CONF_PERFORMANCE_SENSORS, False),
+                ): bool,
+                vol.Required(
+                    CONF_SNAPSHOT_MODE,
+                    default=config.get(CONF_SNAPSHOT_MODE, False),
+                ): bool,
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=config.get(CONF_ADAPTIVE_POLLING, False),
+                ): bool,
+                vol.Optional(
+                    CONF_REFRESH_TIERS,
+                    default=config.get(CONF_REFRESH_TIERS, ""),
+                ): str,
+                vol.Required(
+                    CONF_STATISTICS_AREA,
+                    default=config.get(CONF_STATISTICS_AREA, STATISTICS_AREA_NONE),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[STATISTICS_AREA_NONE, *STATISTICS_AREAS],
+                        translation_key=CONF_STATISTICS_AREA,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
             }
         )
 
@@ -200,9 +264,6 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
             new_options = dict(self.config_entry.options)
             new_options.update(user_input)
 
-            self.hass.async_create_task(
-                self.hass.config_entries.async_reload(self.config_entry.entry_id)
-            )
             return self.async_create_entry(title="", data=new_options)
 
         config = dict(self.config_entry.data) | dict(self.config_entry.options)
@@ -223,66 +284,84 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
             errors=errors,
         )
 
-    async def async_step_add_station(
+    async def async_step_search_station(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle adding a station manually."""
+        """Handle searching stations by name, brand, city or postal code."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            station_id_str = user_input.get("station_id", "").strip()
+            tool: PrixCarburantTool = self.hass.data[DOMAIN][
+                self.config_entry.entry_id
+            ]["tool"]
+            search_index = await tool.async_get_search_index()
+            known_stations = {*self._get_manual_stations(), *tool.stations}
+            self._search_results = {
+                station_id: _get_search_result_label(station_id, fields)
+                for station_id, fields in search_index.search(
+                    user_input["query"], _SEARCH_RESULTS_LIMIT
+                )
+                if int(station_id) not in known_stations
+            }
+            if self._search_results:
+                return await self.async_step_search_results()
+            errors["query"] = "no_search_results"
 
-            # Validate station ID
-            try:
-                station_id = int(station_id_str)
-            except ValueError:
-                errors["station_id"] = "invalid_station_id"
-            else:
-                # Check if already exists in manual stations
-                manual_stations = self._get_manual_stations()
-
-                if station_id in manual_stations:
-                    errors["station_id"] = "station_already_exists"
-                else:
-                    # Check if station exists in coordinator (auto-discovered)
-                    coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id][
-                        "coordinator"
-                    ]
-                    if station_id in coordinator.data:
-                        errors["station_id"] = "station_already_exists"
-                    else:
-                        # Validate station exists in API
-                        is_valid, error_key = await self._validate_station_id(
-                            station_id
-                        )
-
-                        if not is_valid:
-                            errors["station_id"] = error_key
-                        else:
-                            # Add to manual stations
-                            manual_stations.append(station_id)
-
-                            # Update both options and data to ensure persistence
-                            new_options = dict(self.config_entry.options)
-                            new_options[CONF_MANUAL_STATIONS] = manual_stations
-
-                            new_data = dict(self.config_entry.data)
-                            new_data[CONF_MANUAL_STATIONS] = manual_stations
-
-                            self.hass.config_entries.async_update_entry(
-                                self.config_entry, data=new_data, options=new_options
-                            )
-                            self.hass.async_create_task(
-                                self.hass.config_entries.async_reload(
-                                    self.config_entry.entry_id
-                                )
-                            )
-
-                            return self.async_create_entry(title="", data={})
+        return self.async_show_form(
+            step_id="search_station",
+            data_schema=vol.Schema({vol.Required("query"): str}),
+            errors=errors,
+        )
+
+    async def async_step_search_results(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle adding stations selected in the search results."""
+        errors: dict[str, str] = {}
+        placeholders = {"missing": ""}
+
+        if user_input is not None:
+            if not user_input["station_ids"]:
+                errors["station_ids"] = "no_station_selected"
+            elif result := await self._async_validate_and_add_stations(
+                [int(station_id) for station_id in user_input["station_ids"]],
+                errors,
+                placeholders,
+            ):
+                return result
+
+        return self.async_show_form(
+            step_id="search_results",
+            data_schema=vol.Schema(
+                {vol.Required("station_ids"): cv.multi_select(self._search_results)}
+            ),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def async_step_add_station(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle adding stations manually, validated in one batched query."""
+        errors: dict[str, str] = {}
+        placeholders = {"missing": ""}
+
+        if user_input is not None:
+            station_ids_str = _STATION_IDS_SEPARATORS.split(
+                user_input.get("station_ids", "").strip()
+            )
+            if not all(station_id.isdigit() for station_id in station_ids_str):
+                errors["station_ids"] = "invalid_station_id"
+            elif result := await self._async_validate_and_add_stations(
+                list(dict.fromkeys(map(int, station_ids_str))), errors, placeholders
+            ):
+                return result
 
         schema = vol.Schema(
             {
-                vol.Required("station_id"): str,
+                vol.Required("station_ids"): selector.TextSelector(
+                    selector.TextSelectorConfig(multiline=True)
+                ),
             }
         )
 
@@ -290,30 +369,70 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
             step_id="add_station",
             data_schema=schema,
             errors=errors,
+            description_placeholders=placeholders,
         )
 
-    def _remove_station_entities(
-        self, entity_reg: er.EntityRegistry, station_id: str
-    ) -> None:
-        """Remove all entities for a station."""
-        entities = er.async_entries_for_config_entry(
-            entity_reg, self.config_entry.entry_id
+    async def _async_validate_and_add_stations(
+        self,
+        station_ids: list[int],
+        errors: dict[str, str],
+        placeholders: dict[str, str],
+    ) -> ConfigFlowResult | None:
+        """Validate stations in one batched query and add them, or set errors."""
+        manual_stations = self._get_manual_stations()
+        tool: PrixCarburantTool = self.hass.data[DOMAIN][self.config_entry.entry_id][
+            "tool"
+        ]
+        # skip stations already added manually or auto-discovered
+        station_ids = [
+            station_id
+            for station_id in station_ids
+            if station_id not in manual_stations and station_id not in tool.stations
+        ]
+        if not station_ids:
+            errors["station_ids"] = "station_already_exists"
+            return None
+
+        try:
+            stations_data, missing_ids = await tool.fetch_stations_by_ids(
+                station_ids,
+                latitude=self.hass.config.latitude,
+                longitude=self.hass.config.longitude,
+            )
+        except PrixCarburantToolCannotConnectError, PrixCarburantToolRequestError:
+            errors["base"] = "cannot_connect"
+            return None
+        if missing_ids:
+            errors["station_ids"] = "station_not_found"
+            placeholders["missing"] = ", ".join(missing_ids)
+            return None
+        return await self._async_add_stations(
+            manual_stations, station_ids, stations_data
         )
-        for entity in entities:
-            if entity.unique_id.startswith(f"{DOMAIN}_{station_id}_"):
-                entity_reg.async_remove(entity.entity_id)
-
-    def _remove_station_device(
-        self, device_reg: dr.DeviceRegistry, station_id: str
-    ) -> None:
-        """Remove device for a station."""
-        for device in dr.async_entries_for_config_entry(
-            device_reg, self.config_entry.entry_id
-        ):
-            for identifier in device.identifiers:
-                if identifier[0] == DOMAIN and str(identifier[1]) == station_id:
-                    device_reg.async_remove_device(device.id)
-                    return
+
+    async def _async_add_stations(
+        self, manual_stations: list[int], station_ids: list[int], stations_data: dict
+    ) -> ConfigFlowResult:
+        """Add new manual stations to the running entry, then save them."""
+        # the stations are added before saving so the options update listener
+        # only has to create their entities
+        await self.hass.data[DOMAIN][self.config_entry.entry_id]["tool"].add_stations(
+            stations_data
+        )
+        return self._async_save_manual_stations([*manual_stations, *station_ids])
+
+    @callback
+    def _async_save_manual_stations(
+        self, manual_stations: list[int]
+    ) -> ConfigFlowResult:
+        """Save manual stations, applied by the options update listener."""
+        # Update both options and data to ensure persistence
+        new_options = dict(self.config_entry.options)
+        new_options[CONF_MANUAL_STATIONS] = manual_stations
+        new_data = dict(self.config_entry.data)
+        new_data[CONF_MANUAL_STATIONS] = manual_stations
+        self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
+        return self.async_create_entry(title="", data=new_options)
 
     async def async_step_delete_stations(
         self, user_input: dict[str, Any] | None = None
@@ -322,41 +441,18 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            stations_to_remove = user_input.get("stations_to_remove", [])
-
-            if stations_to_remove:
-                # Get registries
-                entity_reg = er.async_get(self.hass)
-                device_reg = dr.async_get(self.hass)
-
-                # Remove entities and devices for each deleted station
-                for station_id in stations_to_remove:
-                    self._remove_station_entities(entity_reg, station_id)
-                    self._remove_station_device(device_reg, station_id)
-
-                manual_stations = self._get_manual_stations()
-
-                # Remove selected stations from manual list
-                for station_id in stations_to_remove:
-                    station_id_int = int(station_id)
-                    if station_id_int in manual_stations:
-                        manual_stations.remove(station_id_int)
-
-                # Update both options and data to ensure persistence
-                new_options = dict(self.config_entry.options)
-                new_options[CONF_MANUAL_STATIONS] = manual_stations
-
-                new_data = dict(self.config_entry.data)
-                new_data[CONF_MANUAL_STATIONS] = manual_stations
-
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry, data=new_data, options=new_options
-                )
-                self.hass.async_create_task(
-                    self.hass.config_entries.async_reload(self.config_entry.entry_id)
-                )
-
-            return self.async_create_entry(title="", data={})
+            stations_to_remove = {
+                int(station_id)
+                for station_id in user_input.get("stations_to_remove", [])
+            }
+            # entities of removed stations are deleted by the update listener
+            return self._async_save_manual_stations(
+                [
+                    station_id
+                    for station_id in self._get_manual_stations()
+                    if station_id not in stations_to_remove
+                ]
+            )
 
         # Get all stations from coordinator
         coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]["coordinator"]
@@ -399,31 +495,45 @@ class PrixCarburantOptionsFlowHandler(OptionsFlow):
             },
         )
 
-    async def _validate_station_id(self, station_id: int) -> tuple[bool, str]:
-        """Validate station ID by checking API."""
-        try:
-            websession = async_get_clientsession(self.hass)
-            tool = PrixCarburantTool(
-                self.hass.config.time_zone,
-                60,
-                api_ssl_check=True,
-                session=websession,
-            )
+    async def async_step_pin_stations(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle stations pinned as entities in station table mode."""
+        if user_input is not None:
+            new_options = dict(self.config_entry.options)
+            new_options[CONF_PINNED_STATIONS] = [
+                int(station_id) for station_id in user_input[CONF_PINNED_STATIONS]
+            ]
 
-            response = await tool.request_api(
-                {
-                    "select": "id",
-                    "where": f"id={station_id}",
-                    "limit": 1,
-                }
-            )
-        except (
-            ClientError,
-            PrixCarburantToolCannotConnectError,
-            PrixCarburantToolRequestError,
+            return self.async_create_entry(title="", data=new_options)
+
+        coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]["coordinator"]
+        stations = coordinator.data
+
+        if not stations:
+            return self.async_abort(reason="no_stations")
+
+        # Nearest stations first, use string keys for cv.multi_select
+        station_options = {}
+        for station_id, station_data in sorted(
+            stations.items(), key=lambda item: item[1].get("distance") or 0
         ):
-            return False, "station_not_found"
-        else:
-            if response["total_count"] == 1:
-                return True, ""
-            return False, "station_not_found"
+            station_name = station_data.get("name", f"Station {station_id}")
+            station_options[str(station_id)] = (
+                f"{station_name} ({station_data.get('distance')} km)"
+            )
+        pinned_stations = [
+            str(station_id)
+            for station_id in self.config_entry.options.get(CONF_PINNED_STATIONS, [])
+            if str(station_id) in station_options
+        ]
+
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_PINNED_STATIONS, default=pinned_stations
+                ): cv.multi_select(station_options),
+            }
+        )
+
+        return self.async_show_form(step_id="pin_stations", data_schema=schema)
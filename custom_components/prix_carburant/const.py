@@ -13,12 +13,30 @@ CONF_STATIONS: Final = "stations"
 CONF_MANUAL_STATIONS: Final = "manual_stations"
 CONF_DISPLAY_ENTITY_PICTURES: Final = "display_entity_pictures"
 CONF_API_SSL_CHECK: Final = "api_ssl_check"
+CONF_STATION_TABLE: Final = "station_table"
+CONF_PINNED_STATIONS: Final = "pinned_stations"
+CONF_PERFORMANCE_SENSORS: Final = "performance_sensors"
+CONF_SNAPSHOT_MODE: Final = "snapshot_mode"
+CONF_ADAPTIVE_POLLING: Final = "adaptive_polling"
+CONF_REFRESH_TIERS: Final = "refresh_tiers"
+CONF_STATISTICS_AREA: Final = "statistics_area"
+
+BRAND_LOGOS_URL_PATH: Final = f"/api/{DOMAIN}/logos"
+# dispatched with the config entry ID suffix when stations or options change
+SIGNAL_UPDATE_ENTITIES: Final = f"{DOMAIN}_update_entities"
 
 DEFAULT_NAME: Final = "Prix Carburant"
 DEFAULT_MAX_KM: Final = 15
 DEFAULT_SCAN_INTERVAL: Final = 4
 
+STATISTICS_AREA_NONE: Final = "none"
+STATISTICS_AREA_DEPARTMENT: Final = "department"
+STATISTICS_AREA_REGION: Final = "region"
+STATISTICS_AREAS: Final = [STATISTICS_AREA_DEPARTMENT, STATISTICS_AREA_REGION]
+
 ATTR_ADDRESS: Final = "address"
+ATTR_AREA: Final = "area"
+ATTR_AREA_CODE: Final = "area_code"
 ATTR_POSTAL_CODE: Final = "postal_code"
 ATTR_BRAND: Final = "brand"
 ATTR_CITY: Final = "city"
@@ -28,7 +46,12 @@ ATTR_FUEL_TYPE: Final = "fuel_type"
 ATTR_UPDATED_DATE: Final = "updated_date"
 ATTR_DAYS_SINCE_LAST_UPDATE: Final = "days_since_last_update"
 ATTR_PRICE: Final = "price"
+ATTR_MIN_PRICE: Final = "min_price"
+ATTR_MAX_PRICE: Final = "max_price"
+ATTR_STATIONS_COUNT: Final = "stations_count"
 ATTR_SHORTAGE_SINCE: Final = "shortage_since"
+ATTR_STATION_ID: Final = "station_id"
+ATTR_STATIONS: Final = "stations"
 
 ATTR_GAZOLE: Final = "Gazole"
 ATTR_SP95: Final = "SP95"
@@ -0,0 +1,43 @@
+"""Diagnostics support for Prix Carburant."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_MANUAL_STATIONS, CONF_PINNED_STATIONS, CONF_STATIONS, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .tools import PrixCarburantTool
+
+# station lists reveal the user location
+TO_REDACT = {CONF_STATIONS, CONF_MANUAL_STATIONS, CONF_PINNED_STATIONS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    tool: PrixCarburantTool = data["tool"]
+    coordinator = data["coordinator"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+        },
+        "stations_count": len(tool.stations),
+        "concurrency_limit": tool.concurrency_limit,
+        "metrics": tool.metrics.as_dict(),
+        "polling_schedule": tool.polling_schedule.as_dict(),
+        "area_statistics": tool.area_statistics,
+    }
@@ -0,0 +1,18 @@
+"""Shared entity helpers for Prix Carburant."""
+
+from __future__ import annotations
+
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+
+from .const import DEFAULT_NAME, DOMAIN
+
+
+def get_integration_device_info(entry_id: str) -> DeviceInfo:
+    """Return the device grouping the integration entities (refresh, performance)."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry_id)},
+        name=DEFAULT_NAME,
+        manufacturer=DEFAULT_NAME,
+        entry_type=DeviceEntryType.SERVICE,
+        configuration_url="https://github.com/Aohzan/hass-prixcarburant/",
+    )
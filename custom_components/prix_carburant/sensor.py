@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
@@ -11,12 +12,27 @@ import voluptuous as vol
 from homeassistant.components.sensor import (
     PLATFORM_SCHEMA_BASE,
     RestoreSensor,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
-from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, ATTR_NAME
+from homeassistant.const import (
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    ATTR_NAME,
+    EntityCategory,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
@@ -26,6 +42,8 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ATTR_ADDRESS,
+    ATTR_AREA,
+    ATTR_AREA_CODE,
     ATTR_BRAND,
     ATTR_CITY,
     ATTR_DAYS_SINCE_LAST_UPDATE,
@@ -35,17 +53,87 @@ from .const import (
     ATTR_POSTAL_CODE,
     ATTR_PRICE,
     ATTR_SHORTAGE_SINCE,
+    ATTR_STATION_ID,
+    ATTR_STATIONS,
     ATTR_UPDATED_DATE,
     CONF_DISPLAY_ENTITY_PICTURES,
     CONF_FUELS,
+    CONF_MANUAL_STATIONS,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_PINNED_STATIONS,
+    CONF_STATION_TABLE,
     CONF_STATIONS,
+    CONF_STATISTICS_AREA,
     DOMAIN,
     FUELS,
+    SIGNAL_UPDATE_ENTITIES,
+    STATISTICS_AREAS,
+)
+from .entity import get_integration_device_info
+from .tools import (
+    PrixCarburantTool,
+    PrixCarburantToolMetrics,
+    get_entity_picture,
+    normalize_string,
 )
-from .tools import PrixCarburantTool, get_entity_picture, normalize_string
 
 _LOGGER = logging.getLogger(__name__)
 
+# (station ID, fuel), (CONF_STATION_TABLE, fuel), (statistics area, fuel)
+# or (CONF_PERFORMANCE_SENSORS, key)
+_EntityKey = tuple[int | str, str]
+
+
+@dataclass(frozen=True, kw_only=True)
+class PrixCarburantPerformanceSensorDescription(SensorEntityDescription):
+    """Describe a performance sensor fed by the tool metrics."""
+
+    value_fn: Callable[[PrixCarburantToolMetrics], float | datetime | None]
+
+
+PERFORMANCE_SENSORS: tuple[PrixCarburantPerformanceSensorDescription, ...] = (
+    PrixCarburantPerformanceSensorDescription(
+        key="last_refresh_duration",
+        name="Prix Carburant - Last refresh duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.last_refresh_duration,
+    ),
+    PrixCarburantPerformanceSensorDescription(
+        key="request_latency_p95",
+        name="Prix Carburant - API request latency p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: (
+            metrics.latency_p95 * 1000 if metrics.latency_p95 is not None else None
+        ),
+    ),
+    PrixCarburantPerformanceSensorDescription(
+        key="failed_stations",
+        name="Prix Carburant - Stations without data",
+        icon="mdi:gas-station-off",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: len(metrics.failed_stations),
+    ),
+    PrixCarburantPerformanceSensorDescription(
+        key="consecutive_failures",
+        name="Prix Carburant - Consecutive refresh failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.consecutive_failures,
+    ),
+    PrixCarburantPerformanceSensorDescription(
+        key="last_successful_update",
+        name="Prix Carburant - Last successful update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda metrics: metrics.last_successful_update,
+    ),
+)
+
 # Validation of the yaml configuration
 PLATFORM_SCHEMA = PLATFORM_SCHEMA_BASE.extend(
     {
@@ -77,27 +165,149 @@ async def async_setup_entry(
 ) -> None:
     """Set up the platform from config_entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    config = entry.data
-    options = entry.options
-
     tool: PrixCarburantTool = data["tool"]
+    performance_sensors = {
+        description.key: description for description in PERFORMANCE_SENSORS
+    }
+    entities: dict[_EntityKey, SensorEntity] = {}
 
-    enabled_fuels = {}
-    for fuel in FUELS:
-        fuel_key = f"{CONF_FUELS}_{fuel}"
-        enabled_fuels[fuel] = options.get(fuel_key, config.get(fuel_key, True))
-
-    entities = []
-    for station_id, station_data in tool.stations.items():
-        entities.extend(
-            [
-                PrixCarburant(station_id, station_data, f, data)
-                for f in FUELS
-                if f in station_data[ATTR_FUELS] and enabled_fuels[f] is True
-            ]
+    def _create_entity(key: _EntityKey) -> SensorEntity:
+        kind, name = key
+        if kind == CONF_STATION_TABLE:
+            return PrixCarburantStationTable(name, data)
+        if kind in STATISTICS_AREAS:
+            return PrixCarburantAreaStatistics(kind, name, tool, data, entry.entry_id)  # type: ignore[arg-type]
+        if kind == CONF_PERFORMANCE_SENSORS:
+            return PrixCarburantPerformanceSensor(
+                performance_sensors[name], tool, data, entry.entry_id
+            )
+        return PrixCarburant(kind, tool.stations[kind], name, data)  # type: ignore[arg-type]
+
+    @callback
+    def _async_update_entities() -> None:
+        """Add and remove entities to match the stations and the options."""
+        wanted = _get_entity_keys(tool, entry.data | entry.options)
+        removed = entities.keys() - wanted.keys()
+        entity_reg = er.async_get(hass)
+        for key in removed:
+            if (entity_id := entities.pop(key).entity_id) is not None:
+                entity_reg.async_remove(entity_id)
+        _remove_station_devices(
+            hass,
+            entry,
+            {key[0] for key in removed if isinstance(key[0], int)}
+            - {key[0] for key in wanted},
+        )
+
+        new_entities = [
+            entities.setdefault(key, _create_entity(key))
+            for key in wanted
+            if key not in entities
+        ]
+        async_add_entities(new_entities, update_before_add=True)
+
+    config = entry.data | entry.options
+    if config.get(CONF_STATION_TABLE, False):
+        _remove_unpinned_stations(hass, entry, _get_pinned_stations(config))
+    _async_update_entities()
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_UPDATE_ENTITIES}_{entry.entry_id}", _async_update_entities
         )
+    )
 
-    async_add_entities(entities, update_before_add=True)
+
+def _get_pinned_stations(config: dict) -> set[int]:
+    """Return the stations which keep their own entities in station table mode."""
+    return {
+        int(station_id)
+        for conf_key in (CONF_PINNED_STATIONS, CONF_MANUAL_STATIONS)
+        for station_id in config.get(conf_key) or []
+    }
+
+
+def _get_entity_keys(tool: PrixCarburantTool, config: dict) -> dict[_EntityKey, None]:
+    """Return the keys of the entities wanted, in creation order."""
+    enabled_fuels = [
+        fuel for fuel in FUELS if config.get(f"{CONF_FUELS}_{fuel}", True) is True
+    ]
+    # In station table mode, only pinned and manual stations get their own entities
+    station_table = config.get(CONF_STATION_TABLE, False)
+    pinned_stations = _get_pinned_stations(config)
+    keys: dict[_EntityKey, None] = {
+        (station_id, fuel): None
+        for station_id, station_data in tool.stations.items()
+        if not station_table or int(station_id) in pinned_stations
+        for fuel in enabled_fuels
+        if fuel in station_data[ATTR_FUELS]
+    }
+    if station_table:
+        keys.update(dict.fromkeys((CONF_STATION_TABLE, fuel) for fuel in enabled_fuels))
+    if (area := config.get(CONF_STATISTICS_AREA)) in STATISTICS_AREAS:
+        keys.update(dict.fromkeys((area, fuel) for fuel in enabled_fuels))
+    if config.get(CONF_PERFORMANCE_SENSORS):
+        keys.update(
+            dict.fromkeys(
+                (CONF_PERFORMANCE_SENSORS, description.key)
+                for description in PERFORMANCE_SENSORS
+            )
+        )
+    return keys
+
+
+def _remove_station_devices(
+    hass: HomeAssistant, entry: ConfigEntry, station_ids: set[int]
+) -> None:
+    """Remove devices of stations without entities anymore."""
+    station_ids_str = {str(station_id) for station_id in station_ids}
+    device_reg = dr.async_get(hass)
+    for device in dr.async_entries_for_config_entry(device_reg, entry.entry_id):
+        if any(
+            identifier[0] == DOMAIN and str(identifier[1]) in station_ids_str
+            for identifier in device.identifiers
+        ):
+            device_reg.async_remove_device(device.id)
+
+
+def _remove_unpinned_stations(
+    hass: HomeAssistant, entry: ConfigEntry, pinned_stations: set[int]
+) -> None:
+    """Remove devices and entities of stations not pinned anymore."""
+    entity_reg = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_reg, entry.entry_id):
+        station_id = entity.unique_id.removeprefix(f"{DOMAIN}_").split("_")[0]
+        if station_id.isdigit() and int(station_id) not in pinned_stations:
+            entity_reg.async_remove(entity.entity_id)
+
+    device_reg = dr.async_get(hass)
+    for device in dr.async_entries_for_config_entry(device_reg, entry.entry_id):
+        for identifier in device.identifiers:
+            if (
+                identifier[0] == DOMAIN
+                and str(identifier[1]).isdigit()
+                and int(identifier[1]) not in pinned_stations
+            ):
+                device_reg.async_remove_device(device.id)
+                break
+
+
+def _get_station_name(station_id: int, station_info: dict) -> str:
+    """Return the display name of a station."""
+    if station_info[ATTR_NAME] != "undefined":
+        station_name = station_info[ATTR_NAME]
+    elif station_info[ATTR_BRAND] and station_info[ATTR_CITY]:
+        station_name = f"{station_info[ATTR_BRAND]} {station_info[ATTR_CITY]}"
+    elif station_info[ATTR_BRAND]:
+        station_name = f"{station_info[ATTR_BRAND]} {station_id}"
+    else:
+        station_name = str(station_id)
+
+    # Add 'Station' prefix if needed
+    if not station_name.lower().startswith(
+        "station"
+    ) and not station_name.lower().startswith("relais"):
+        station_name = f"Station {station_name}"
+    return station_name
 
 
 class PrixCarburant(CoordinatorEntity, RestoreSensor):
@@ -120,29 +330,12 @@ class PrixCarburant(CoordinatorEntity, RestoreSensor):
         self._last_update = None
         self._last_value: float | None = None
         self._attr_unique_id = "_".join([DOMAIN, str(self.station_id), self.fuel])
-        if self.station_info[ATTR_NAME] != "undefined":
-            station_name = self.station_info[ATTR_NAME]
-        elif self.station_info[ATTR_BRAND] and self.station_info[ATTR_CITY]:
-            station_name = (
-                f"{self.station_info[ATTR_BRAND]} {self.station_info[ATTR_CITY]}"
-            )
-        elif self.station_info[ATTR_BRAND]:
-            station_name = f"{self.station_info[ATTR_BRAND]} {self.station_id}"
-        else:
-            station_name = str(self.station_id)
-
-        # Add 'Station' prefix if needed
-        if not station_name.lower().startswith(
-            "station"
-        ) and not station_name.lower().startswith("relais"):
-            station_name = f"Station {station_name}"
+        station_name = _get_station_name(self.station_id, self.station_info)
 
         self._attr_name = f"{station_name} {self.fuel}"
 
-        if entry_data["options"][CONF_DISPLAY_ENTITY_PICTURES] is True:
-            self._attr_entity_picture = get_entity_picture(
-                self.station_info[ATTR_BRAND]
-            )
+        # options updated in place when entity pictures are toggled
+        self._entry_options = entry_data["options"]
 
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self.station_id)},
@@ -153,7 +346,7 @@ class PrixCarburant(CoordinatorEntity, RestoreSensor):
             + str(self.station_id),
         )
         self._attr_extra_state_attributes = {
-            "station_id": str(self.station_id),
+            ATTR_STATION_ID: str(self.station_id),
             ATTR_NAME: normalize_string(self.station_info[ATTR_NAME]),
             ATTR_BRAND: self.station_info[ATTR_BRAND],
             ATTR_ADDRESS: normalize_string(self.station_info[ATTR_ADDRESS]),
@@ -176,10 +369,19 @@ class PrixCarburant(CoordinatorEntity, RestoreSensor):
         if (last_state := await self.async_get_last_sensor_data()) is not None:
             self._last_value = last_state.native_value
 
+    @property
+    def entity_picture(self) -> str | None:
+        """Return the brand logo if entity pictures are displayed."""
+        if self._entry_options[CONF_DISPLAY_ENTITY_PICTURES] is True:
+            return get_entity_picture(self.station_info[ATTR_BRAND])
+        return None
+
     @property
     def native_value(self) -> float | None:
         """Return the current price."""
-        if fuel := self.coordinator.data[self.station_id][ATTR_FUELS].get(self.fuel):
+        # the station may be removed before its entity
+        station_info = self.coordinator.data.get(self.station_id)
+        if station_info and (fuel := station_info[ATTR_FUELS].get(self.fuel)):
             # Update date in attributes
             self._attr_extra_state_attributes |= {
                 ATTR_UPDATED_DATE: fuel.get(ATTR_UPDATED_DATE),
@@ -204,3 +406,138 @@ class PrixCarburant(CoordinatorEntity, RestoreSensor):
                 self._last_value = round(float(fuel[ATTR_PRICE]), 3)
                 return self._last_value
         return self._last_value
+
+
+class PrixCarburantStationTable(CoordinatorEntity, SensorEntity):
+    """Representation of a fuel sensor listing prices of all stations."""
+
+    _attr_icon = "mdi:gas-station"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "€/l"
+    _attr_suggested_display_precision = 3
+    # the table can hold thousands of rows, keep it out of the recorder
+    _unrecorded_attributes = frozenset({ATTR_STATIONS})
+
+    def __init__(self, fuel: str, entry_data: dict) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry_data["coordinator"])
+        self.fuel = fuel
+        self._attr_unique_id = f"{DOMAIN}_{CONF_STATION_TABLE}_{self.fuel}"
+        self._attr_name = f"Prix Carburant {self.fuel}"
+        self._update_table()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Rebuild the stations table when new prices are received."""
+        self._update_table()
+        super()._handle_coordinator_update()
+
+    def _update_table(self) -> None:
+        """Build the stations table sorted by price, then distance."""
+        table = [
+            {
+                ATTR_STATION_ID: str(station_id),
+                ATTR_NAME: _get_station_name(station_id, station_info),
+                ATTR_PRICE: round(float(fuel[ATTR_PRICE]), 3),
+                ATTR_DISTANCE: station_info[ATTR_DISTANCE],
+                ATTR_UPDATED_DATE: fuel.get(ATTR_UPDATED_DATE),
+            }
+            for station_id, station_info in self.coordinator.data.items()
+            if (fuel := station_info[ATTR_FUELS].get(self.fuel))
+            and fuel.get(ATTR_PRICE) is not None
+        ]
+        table.sort(
+            key=lambda row: (
+                row[ATTR_PRICE],
+                row[ATTR_DISTANCE] if row[ATTR_DISTANCE] is not None else 0,
+            )
+        )
+        self._attr_native_value = table[0][ATTR_PRICE] if table else None
+        self._attr_extra_state_attributes = {
+            ATTR_FUEL_TYPE: self.fuel,
+            ATTR_STATIONS: table,
+        }
+
+
+class PrixCarburantPerformanceSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a refresh and API health diagnostic sensor."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: PrixCarburantPerformanceSensorDescription
+
+    def __init__(
+        self,
+        description: PrixCarburantPerformanceSensorDescription,
+        tool: PrixCarburantTool,
+        entry_data: dict,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry_data["coordinator"])
+        self.entity_description = description
+        self.tool = tool
+        self._attr_unique_id = f"{DOMAIN}_performance_{description.key}"
+        self._attr_device_info = get_integration_device_info(entry_id)
+
+    @property
+    def native_value(self) -> float | datetime | None:
+        """Return the value from the live tool counters."""
+        return self.entity_description.value_fn(self.tool.metrics)
+
+
+class PrixCarburantAreaStatistics(CoordinatorEntity, SensorEntity):
+    """Representation of a fuel average price in the department or region."""
+
+    _attr_icon = "mdi:gas-station-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "€/l"
+    _attr_suggested_display_precision = 3
+
+    def __init__(
+        self,
+        area: str,
+        fuel: str,
+        tool: PrixCarburantTool,
+        entry_data: dict,
+        entry_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry_data["coordinator"])
+        self.area = area
+        self.fuel = fuel
+        self.tool = tool
+        self._attr_unique_id = f"{DOMAIN}_{area}_{fuel}"
+        self._attr_name = f"Prix Carburant {fuel} {area} average"
+        self._attr_device_info = get_integration_device_info(entry_id)
+
+    @property
+    def _area_statistics(self) -> dict:
+        """Return the statistics of the area, empty if of another area."""
+        statistics = self.tool.area_statistics
+        return statistics if statistics.get(ATTR_AREA) == self.area else {}
+
+    @property
+    def _statistics(self) -> dict | None:
+        """Return the statistics of the fuel in the area."""
+        return self._area_statistics.get(ATTR_FUELS, {}).get(self.fuel)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the average price in the area."""
+        if (statistics := self._statistics) is None:
+            return None
+        return statistics[ATTR_PRICE]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the minimum and maximum prices in the area."""
+        attributes = {
+            ATTR_FUEL_TYPE: self.fuel,
+            ATTR_AREA: self.area,
+            ATTR_AREA_CODE: self._area_statistics.get(ATTR_AREA_CODE),
+        }
+        if (statistics := self._statistics) is not None:
+            attributes |= {
+                key: value for key, value in statistics.items() if key != ATTR_PRICE
+            }
+        return attributes
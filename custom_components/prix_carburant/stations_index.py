@@ -0,0 +1,308 @@
+"""
+Precompiled index of station names for Prix Carburant.
+
+The shipped OSM CSV and custom JSON sources are merged at build time
+(scripts/build_stations_index.py) into a SQLite file, sorted by station ID,
+so the integration looks stations up instead of parsing both sources on
+start. The search index finds stations by prefixes of their names, brands,
+cities, postal codes and IDs. This module has no Home Assistant dependency
+to be usable by scripts.
+"""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+import re
+import sqlite3
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+INDEX_FORMAT_VERSION = 1
+STATIONS_INDEX_FILE = "stations_name.db"
+SOURCE_OSM = "osm"
+SOURCE_CUSTOM = "custom"
+# memory mapped size of the index, larger than the file
+_INDEX_MMAP_SIZE = 16 * 1024 * 1024
+_DELETE_TAG = "DELETE TAG"
+_SEARCH_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# weight of a match per field, a name match ranks before a postal code match
+SEARCH_FIELDS_WEIGHTS = {"name": 4, "brand": 3, "city": 3, "postal_code": 2, "id": 1}
+# bonus factor of a query word matching a whole word instead of its prefix
+_SEARCH_EXACT_MATCH_FACTOR = 2
+# prefixes up to this length match many words, their rankings are precomputed
+_SEARCH_MERGED_PREFIX_LENGTH = 2
+# (negated score, lowercase name, station ID), sorted best first
+_Posting = tuple[int, str, str]
+
+
+class StationsIndexError(Exception):
+    """Exception to indicate a missing or incompatible stations index."""
+
+
+def parse_stations_csv(lines: Iterable[str]) -> dict[str, dict]:
+    """Parse stations CSV lines into a {station_id: {name, brand}} dict."""
+    result: dict[str, dict] = {}
+    reader = csv.DictReader(lines)
+    for row in reader:
+        raw_ids = row.get("ref:FR:prix-carburants", "").strip()
+        if not raw_ids or raw_ids.startswith(_DELETE_TAG):
+            continue
+
+        def _clean(value: str) -> str:
+            value = value.strip()
+            return "" if value.startswith(_DELETE_TAG) else value
+
+        name = _clean(row.get("name", ""))
+        brand = _clean(row.get("brand", ""))
+        if not brand:
+            brand = _clean(row.get("operator", ""))
+        if not brand:
+            brand = _clean(row.get("branch", ""))
+
+        if not name and not brand:
+            continue
+        for raw_station_id in raw_ids.split(";"):
+            station_id = raw_station_id.strip()
+            if station_id and station_id not in result:
+                result[station_id] = {"name": name, "brand": brand}
+    return result
+
+
+def build_stations_index(
+    path: Path,
+    osm_stations: dict[str, dict],
+    custom_stations: dict[str, dict],
+    metadata: dict[str, str],
+) -> None:
+    """
+    Write the stations index of both sources to path.
+
+    Sources are kept apart so the integration can replace one of them by its
+    fresher remote version, custom entries taking precedence over OSM ones.
+    """
+    path.unlink(missing_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.execute(
+                "CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                " WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE TABLE stations (id INTEGER NOT NULL, source TEXT NOT NULL,"
+                " data TEXT NOT NULL, PRIMARY KEY (id, source)) WITHOUT ROWID"
+            )
+            connection.executemany(
+                "INSERT INTO metadata VALUES (?, ?)",
+                sorted(
+                    {**metadata, "format_version": str(INDEX_FORMAT_VERSION)}.items()
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO stations VALUES (?, ?, ?)",
+                sorted(
+                    (int(station_id), source, json.dumps(data, ensure_ascii=False))
+                    for source, stations in (
+                        (SOURCE_OSM, osm_stations),
+                        (SOURCE_CUSTOM, custom_stations),
+                    )
+                    for station_id, data in stations.items()
+                ),
+            )
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+
+class StationsNameIndex:
+    """Read-only lookups in the precompiled stations index."""
+
+    def __init__(self, path: Path) -> None:
+        """Open the index, raise StationsIndexError if unusable."""
+        try:
+            self._connection = sqlite3.connect(
+                f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._connection.execute(f"PRAGMA mmap_size={_INDEX_MMAP_SIZE}")
+            self.metadata: dict[str, str] = dict(
+                self._connection.execute("SELECT key, value FROM metadata")
+            )
+        except sqlite3.Error as err:
+            msg = f"Cannot open stations index {path}: {err}"
+            raise StationsIndexError(msg) from err
+        if self.metadata.get("format_version") != str(INDEX_FORMAT_VERSION):
+            self._connection.close()
+            msg = (
+                f"Stations index {path} has format version "
+                f"{self.metadata.get('format_version')}, "
+                f"expected {INDEX_FORMAT_VERSION}"
+            )
+            raise StationsIndexError(msg)
+
+    def get(self, station_id: str, source: str) -> dict | None:
+        """Return the data of a station from a source, None if not indexed."""
+        if not station_id.isdigit():
+            return None
+        row = self._connection.execute(
+            "SELECT data FROM stations WHERE id = ? AND source = ?",
+            (int(station_id), source),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def items(self, source: str) -> Iterator[tuple[str, dict]]:
+        """Iterate over the station IDs and data of a source."""
+        for station_id, data in self._connection.execute(
+            "SELECT id, data FROM stations WHERE source = ?", (source,)
+        ):
+            yield str(station_id), json.loads(data)
+
+    def close(self) -> None:
+        """Close the index."""
+        self._connection.close()
+
+
+def tokenize_search_text(text: str) -> list[str]:
+    """Return the lowercase words of a text, without accents."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return _SEARCH_TOKEN_PATTERN.findall(
+        "".join(char for char in text if not unicodedata.combining(char))
+    )
+
+
+class StationsSearchIndex:
+    """
+    In-memory prefix index of stations words.
+
+    Words of every field are kept in a sorted list, so the words starting with
+    a query word are found by bisection, each with its stations already ranked.
+    The ranked stations of the shortest prefixes, which match most words, are
+    merged at build time. A search reads the ranked stations of every query
+    word in turn and stops as soon as no station left can rank better than the
+    ones found (threshold algorithm), so it only reads the head of the lists.
+    """
+
+    def __init__(self, stations: Iterable[tuple[str, dict]]) -> None:
+        """Build the index of station_id -> {name, brand, city, postal_code}."""
+        self._stations: dict[str, dict] = {}
+        self._sort_names: dict[str, str] = {}
+        self._station_tokens: dict[str, dict[str, int]] = {}
+        postings: defaultdict[str, list[_Posting]] = defaultdict(list)
+        for station_id, fields in stations:
+            self._stations[station_id] = fields
+            self._sort_names[station_id] = sort_name = (
+                fields.get("name") or ""
+            ).lower()
+            self._station_tokens[station_id] = tokens = {}
+            for field, weight in SEARCH_FIELDS_WEIGHTS.items():
+                value = station_id if field == "id" else fields.get(field)
+                for token in tokenize_search_text(str(value or "")):
+                    tokens[token] = max(weight, tokens.get(token, 0))
+            for token, weight in tokens.items():
+                postings[token].append((-weight, sort_name, station_id))
+
+        self._tokens = sorted(postings)
+        self._postings = [sorted(postings[token]) for token in self._tokens]
+        prefix_postings: defaultdict[str, list[_Posting]] = defaultdict(list)
+        for token, token_postings in zip(self._tokens, self._postings, strict=True):
+            for length in range(1, _SEARCH_MERGED_PREFIX_LENGTH + 1):
+                if len(token) >= length:
+                    prefix_postings[token[:length]].extend(token_postings)
+        self._prefix_postings = {
+            prefix: sorted(prefix_postings[prefix]) for prefix in prefix_postings
+        }
+
+    def __len__(self) -> int:
+        """Return the number of indexed stations."""
+        return len(self._stations)
+
+    def _iter_ranked(self, query_token: str) -> Iterator[_Posting]:
+        """
+        Iterate over the stations matching a query word, best score first.
+
+        A station matching several words is repeated, its best score first.
+        """
+        start = bisect_left(self._tokens, query_token)
+        # tokens only contain [a-z0-9], all sorted before "{"
+        end = bisect_left(self._tokens, query_token + "{", start)
+        if start == end:
+            return iter(())
+        prefix_matches: Iterable[_Posting]
+        if len(query_token) <= _SEARCH_MERGED_PREFIX_LENGTH:
+            prefix_matches = self._prefix_postings[query_token]
+        else:
+            prefix_matches = heapq.merge(
+                *(self._postings[position] for position in range(start, end))
+            )
+        # the whole word sorts first among the words starting with it
+        if self._tokens[start] != query_token:
+            return iter(prefix_matches)
+        return heapq.merge(
+            (
+                (weight * _SEARCH_EXACT_MATCH_FACTOR, sort_name, station_id)
+                for weight, sort_name, station_id in self._postings[start]
+            ),
+            prefix_matches,
+        )
+
+    def _get_rank(self, station_id: str, query_tokens: list[str]) -> _Posting | None:
+        """Return the rank of a station for a query, None if a word is missing."""
+        tokens = self._station_tokens[station_id]
+        score = 0
+        for query_token in query_tokens:
+            word_score = max(
+                (
+                    weight * _SEARCH_EXACT_MATCH_FACTOR
+                    if token == query_token
+                    else weight
+                    for token, weight in tokens.items()
+                    if token.startswith(query_token)
+                ),
+                default=0,
+            )
+            if not word_score:
+                return None
+            score += word_score
+        return (-score, self._sort_names[station_id], station_id)
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[str, dict]]:
+        """
+        Return the best stations matching every word of the query.
+
+        Stations are ranked by the sum, for each query word, of the weight of
+        the best field containing a word starting with it, doubled when it is
+        the whole word, then by name.
+        """
+        query_tokens = list(dict.fromkeys(tokenize_search_text(query)))
+        streams = [self._iter_ranked(query_token) for query_token in query_tokens]
+        heads = [next(stream, None) for stream in streams]
+        results: list[_Posting] = []
+        seen: set[str] = set()
+        # a station matching the query is in every stream: stop when one ends
+        while heads and None not in heads:
+            for position, stream in enumerate(streams):
+                station_id = heads[position][2]  # type: ignore[index]
+                if station_id not in seen:
+                    seen.add(station_id)
+                    if (rank := self._get_rank(station_id, query_tokens)) is not None:
+                        insort(results, rank)
+                        del results[limit:]
+                heads[position] = next(stream, None)
+            if None in heads:
+                break
+            # a station not seen yet ranks at best with the score of every head
+            # and, on a tie, with a name after theirs
+            threshold = (
+                sum(head[0] for head in heads),  # type: ignore[index]
+                max(head[1] for head in heads),  # type: ignore[index]
+            )
+            if len(results) == limit and results[-1][:2] <= threshold:
+                break
+        return [(station_id, self._stations[station_id]) for *_, station_id in results]
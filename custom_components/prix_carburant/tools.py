@@ -2,34 +2,61 @@
 
 import asyncio
 import bz2
-import csv
+import heapq
 import io
 import json
 import logging
+import time
 from asyncio import sleep, timeout
-from math import atan2, cos, radians, sin, sqrt
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import UTC, datetime, timedelta
+from hashlib import sha256
+from math import atan2, ceil, cos, fsum, pi, radians, sin, sqrt
+from operator import itemgetter
 from pathlib import Path
 from socket import gaierror
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
 
-from aiohttp import ClientError, ClientSession
+from aiohttp import ClientError, ClientSession, hdrs
 from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, ATTR_NAME
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
 from .const import (
     ATTR_ADDRESS,
+    ATTR_AREA,
+    ATTR_AREA_CODE,
     ATTR_BRAND,
     ATTR_CITY,
     ATTR_DISTANCE,
     ATTR_FUELS,
+    ATTR_MAX_PRICE,
+    ATTR_MIN_PRICE,
     ATTR_POSTAL_CODE,
     ATTR_PRICE,
     ATTR_SHORTAGE_SINCE,
+    ATTR_STATIONS_COUNT,
     ATTR_UPDATED_DATE,
+    BRAND_LOGOS_URL_PATH,
     FUELS,
 )
+from .stations_index import (
+    SOURCE_CUSTOM,
+    SOURCE_OSM,
+    STATIONS_INDEX_FILE,
+    StationsIndexError,
+    StationsNameIndex,
+    StationsSearchIndex,
+    parse_stations_csv,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 PRIX_CARBURANT_API_URL = "https://data.economie.gouv.fr/api/explore/v2.1/catalog/datasets/prix-des-carburants-en-france-flux-instantane-v2/records"
+PRIX_CARBURANT_EXPORT_URL = "https://data.economie.gouv.fr/api/explore/v2.1/catalog/datasets/prix-des-carburants-en-france-flux-instantane-v2/exports/jsonl"
 STATIONS_NAME_OSM_URL = (
     "https://www.data.gouv.fr/api/1/datasets/r/fcab3bd4-6c6d-4b73-95d2-cfd5e04ee651"
 )
@@ -38,111 +65,659 @@ STATIONS_NAME_FILE = "stations_name.json"
 STATIONS_NAME_URL = "https://raw.githubusercontent.com/Aohzan/hass-prixcarburant/refs/heads/master/custom_components/prix_carburant/stations_name.json"
 BRAND_LOGO_BASE_URL = "https://raw.githubusercontent.com/Aohzan/hass-prixcarburant/refs/heads/master/brand_logos/"
 HTTP_OK = 200
-_DELETE_TAG = "DELETE TAG"
-_MAX_CONCURRENT_API_REQUESTS = 5
+HTTP_NOT_MODIFIED = 304
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_INTERNAL_SERVER_ERROR = 500
+# maximum number of records returned by one API request
+_API_PAGE_SIZE = 100
+# bounds of the adaptive number of concurrent API requests
+_INITIAL_CONCURRENT_API_REQUESTS = 5
+_MIN_CONCURRENT_API_REQUESTS = 1
+_MAX_CONCURRENT_API_REQUESTS = 20
+# characters of an overload response body kept in its error message
+_ERROR_BODY_LENGTH = 200
+# successful requests slower than this (seconds) do not increase concurrency
+_API_LATENCY_TARGET = 2
+# discovery tiles with more stations than this are split in 4 instead of paged:
+# the pages of a tile are requested together, while each split level waits for
+# the counts of its tiles, so splitting every tile above one page is slower
+_TILE_MAX_STATIONS = 1000
+_TILE_MAX_DEPTH = 8
+# earth radius of the haversine distances, and the matching degree size
+_EARTH_RADIUS_KM = 6371
+_KM_PER_LATITUDE_DEGREE = _EARTH_RADIUS_KM * pi / 180
+# the root tile is enlarged so the discovery circle edge is always within it,
+# despite the curvature of the earth and float rounding
+_ROOT_TILE_MARGIN = 1.01
+# fields of the national snapshot: station location, address and fuel prices
+_SNAPSHOT_SELECT = (
+    "id,latitude,longitude,cp,adresse,ville,code_departement,code_region,"  # codespell:ignore-words-list=adresse
+    + ",".join(
+        f"{fuel.lower()}_{suffix}"
+        for suffix in ("prix", "maj", "rupture_debut", "rupture_type")
+        for fuel in FUELS
+    )
+)
+# dataset field of the code of each statistics area
+_AREA_FIELDS = {"department": "code_departement", "region": "code_region"}
+# upper bounds in seconds of the request latency histogram buckets
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_LATENCY_SAMPLES = 500
+# observed price updates needed before polling adapts to them
+_POLLING_MIN_OBSERVATIONS = 50
+# weight of an observed price update is halved after this delay
+_POLLING_HALF_LIFE = timedelta(days=14)
+_POLLING_MIN_INTERVAL = timedelta(minutes=15)
+# share of the mean hourly weight added to every hour, so none is never polled
+_POLLING_PRIOR = 0.05
 
 
-def _parse_stations_csv(content: str) -> dict[str, dict]:
-    """Parse a stations CSV string into a {station_id: {name, brand}} dict."""
-    result: dict[str, dict] = {}
-    reader = csv.DictReader(io.StringIO(content))
-    for row in reader:
-        raw_ids = row.get("ref:FR:prix-carburants", "").strip()
-        if not raw_ids or raw_ids.startswith(_DELETE_TAG):
-            continue
+def _chunks(items: list, size: int = _API_PAGE_SIZE) -> list[list]:
+    """Split a list in chunks of at most `size` items."""
+    return [items[index : index + size] for index in range(0, len(items), size)]
 
-        def _clean(value: str) -> str:
-            value = value.strip()
-            return "" if value.startswith(_DELETE_TAG) else value
 
-        name = _clean(row.get("name", ""))
-        brand = _clean(row.get("brand", ""))
-        if not brand:
-            brand = _clean(row.get("operator", ""))
-        if not brand:
-            brand = _clean(row.get("branch", ""))
+class _AdaptiveConcurrencyLimiter:
+    """
+    Limit concurrent API requests with an AIMD controller.
 
-        if not name and not brand:
-            continue
-        for raw_station_id in raw_ids.split(";"):
-            station_id = raw_station_id.strip()
-            if station_id and station_id not in result:
-                result[station_id] = {"name": name, "brand": brand}
-    return result
+    The limit grows by one after a window of `limit` fast successful requests,
+    and is halved on timeouts, 429 and 5xx responses. Congestion signals of
+    requests started before the last decrease are ignored, so a burst of
+    failures only halves the limit once.
+    """
+
+    def __init__(
+        self,
+        initial: int = _INITIAL_CONCURRENT_API_REQUESTS,
+        minimum: int = _MIN_CONCURRENT_API_REQUESTS,
+        maximum: int = _MAX_CONCURRENT_API_REQUESTS,
+        latency_target: float = _API_LATENCY_TARGET,
+    ) -> None:
+        """Init limiter."""
+        self._limit = initial
+        self._minimum = minimum
+        self._maximum = maximum
+        self._latency_target = latency_target
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Return the current concurrency limit."""
+        return self._limit
+
+    async def acquire(self) -> None:
+        """Wait for a request slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        """Release a request slot."""
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """Additive increase after a window of fast successful requests."""
+        if latency > self._latency_target:
+            self._successes = 0
+            return
+        self._successes += 1
+        if self._successes >= self._limit:
+            self._successes = 0
+            self._limit = min(self._maximum, self._limit + 1)
+
+    def on_congestion(self, started_at: float) -> None:
+        """Multiplicative decrease on timeout or overload response."""
+        if started_at < self._last_decrease:
+            return
+        self._successes = 0
+        self._last_decrease = time.perf_counter()
+        self._limit = max(self._minimum, self._limit // 2)
+        _LOGGER.debug("API congestion, concurrency limited to %s", self._limit)
+
+
+class PrixCarburantToolMetrics:
+    """Performance counters of a PrixCarburantTool."""
+
+    def __init__(self) -> None:
+        """Init counters."""
+        self.requests = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.pages_fetched = 0
+        self.stations_missing = 0
+        self.local_data_hits = 0
+        self.local_data_misses = 0
+        self.latency_histogram: dict[str, int] = dict.fromkeys(
+            [*(f"le_{bucket}" for bucket in _LATENCY_BUCKETS), "le_inf"], 0
+        )
+        self.latencies: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self.initialize_phases: dict[str, float] = {}
+        self.setup_timeline: list[dict] = []
+        self._timeline_start: float | None = None
+        self._timeline_depth = 0
+        self.last_refresh_duration: float | None = None
+        self.failed_stations: list[str] = []
+        self.consecutive_failures = 0
+        self.last_successful_update: datetime | None = None
+
+    @property
+    def latency_p95(self) -> float | None:
+        """Return the 95th percentile of recent request latencies in seconds."""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[ceil(len(latencies) * 0.95) - 1]
+
+    def record_request(self, duration: float, size: int) -> None:
+        """Record a successful API request."""
+        self.pages_fetched += 1
+        self.bytes_received += size
+        self.latencies.append(duration)
+        bucket = next(
+            (f"le_{bucket}" for bucket in _LATENCY_BUCKETS if duration <= bucket),
+            "le_inf",
+        )
+        self.latency_histogram[bucket] += 1
+
+    def record_refresh(self, duration: float, failed_stations: list[str]) -> None:
+        """Record a successful prices refresh."""
+        self.last_refresh_duration = round(duration, 3)
+        self.failed_stations = failed_stations
+        self.stations_missing += len(failed_stations)
+        self.consecutive_failures = 0
+        self.last_successful_update = datetime.now(tz=UTC)
+
+    def record_refresh_failure(self, duration: float) -> None:
+        """Record a failed prices refresh."""
+        self.last_refresh_duration = round(duration, 3)
+        self.consecutive_failures += 1
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Measure the duration of an initialization phase."""
+        start = time.perf_counter()
+        try:
+            with self.span(phase):
+                yield
+        finally:
+            self.initialize_phases[phase] = round(time.perf_counter() - start, 3)
+
+    @contextmanager
+    def timeline(self, name: str) -> Iterator[None]:
+        """Record the spans run within, then log them as one debug record."""
+        self.setup_timeline = []
+        self._timeline_start = time.perf_counter()
+        self._timeline_depth = 0
+        try:
+            with self.span(name):
+                yield
+        finally:
+            self._timeline_start = None
+            _LOGGER.debug(
+                "Timeline (start, duration in seconds):\n%s",
+                "\n".join(
+                    f"{'  ' * span['depth']}{span['name']}: "
+                    f"{span['start']:.3f} +{span['duration']:.3f}"
+                    for span in self.setup_timeline
+                ),
+            )
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Record a span of the current timeline, if any."""
+        if self._timeline_start is None:
+            yield
+            return
+        record = {
+            "name": name,
+            "depth": self._timeline_depth,
+            "start": round(time.perf_counter() - self._timeline_start, 3),
+            "duration": None,
+        }
+        self.setup_timeline.append(record)
+        self._timeline_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timeline_depth -= 1
+            record["duration"] = round(time.perf_counter() - start, 3)
+
+    def as_dict(self) -> dict:
+        """Return counters as a dict."""
+        lookups = self.local_data_hits + self.local_data_misses
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+            "pages_fetched": self.pages_fetched,
+            "stations_missing": self.stations_missing,
+            "local_data_hit_ratio": (
+                round(self.local_data_hits / lookups, 3) if lookups else None
+            ),
+            "latency_histogram": dict(self.latency_histogram),
+            "latency_p95": self.latency_p95,
+            "initialize_phases": dict(self.initialize_phases),
+            "setup_timeline": list(self.setup_timeline),
+            "last_refresh_duration": self.last_refresh_duration,
+            "failed_stations": len(self.failed_stations),
+            "consecutive_failures": self.consecutive_failures,
+            "last_successful_update": (
+                self.last_successful_update.isoformat()
+                if self.last_successful_update
+                else None
+            ),
+        }
+
+
+class AdaptivePollingSchedule:
+    """
+    Polling schedule learned from the observed price update times.
+
+    Changed `*_maj` dates are counted per hour of the day in the user time
+    zone, older ones weighing less. The daily polls budget of the fixed
+    interval is spread over the day with a density proportional to the
+    square root of the hourly update rate, which minimizes the mean age of
+    the prices: polls are dense in the morning and sparse at night.
+    """
+
+    def __init__(self, time_zone: str = "Europe/Paris") -> None:
+        """Init an empty histogram."""
+        self._time_zone = ZoneInfo(time_zone)
+        self.histogram: list[float] = [0.0] * 24
+        self._decayed_at: datetime | None = None
+
+    @property
+    def observations(self) -> float:
+        """Return the weighted number of observed price updates."""
+        return sum(self.histogram)
+
+    def record_updates(self, updated_dates: Iterable[str]) -> None:
+        """Count price update dates in the histogram of their local hour."""
+        now = datetime.now(tz=UTC)
+        if self._decayed_at is not None:
+            factor = 0.5 ** ((now - self._decayed_at) / _POLLING_HALF_LIFE)
+            self.histogram = [weight * factor for weight in self.histogram]
+        self._decayed_at = now
+        for updated_date in updated_dates:
+            try:
+                updated_at = datetime.fromisoformat(updated_date)
+            except ValueError:
+                continue
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=UTC)
+            self.histogram[updated_at.astimezone(self._time_zone).hour] += 1
+
+    def get_next_interval(self, now: datetime, interval: timedelta) -> timedelta:
+        """
+        Return the delay until the next poll, for a fixed interval budget.
+
+        Until enough updates are observed, the fixed interval is returned.
+        """
+        observations = self.observations
+        if observations < _POLLING_MIN_OBSERVATIONS:
+            return interval
+        prior = observations / 24 * _POLLING_PRIOR
+        rates = [sqrt(weight + prior) for weight in self.histogram]
+        polls_per_hour = 24 / (interval / timedelta(hours=1)) / sum(rates)
+        densities = [rate * polls_per_hour for rate in rates]
+
+        # walk the hours until one poll is due
+        poll_at = now.astimezone(self._time_zone)
+        remaining = 1.0
+        while True:
+            hour_end = poll_at.replace(minute=0, second=0, microsecond=0) + timedelta(
+                hours=1
+            )
+            hours_left = (hour_end - poll_at) / timedelta(hours=1)
+            density = densities[poll_at.hour]
+            if density * hours_left >= remaining:
+                poll_at += timedelta(hours=remaining / density)
+                break
+            remaining -= density * hours_left
+            poll_at = hour_end
+        return max(poll_at - now, _POLLING_MIN_INTERVAL)
+
+    def as_dict(self) -> dict:
+        """Return the histogram as a dict."""
+        return {
+            "observations": round(self.observations, 1),
+            "histogram": [round(weight, 1) for weight in self.histogram],
+        }
+
+    def as_stored(self) -> dict:
+        """Return the histogram and its decay date, for storage."""
+        return {
+            "histogram": self.histogram,
+            "decayed_at": self._decayed_at.isoformat() if self._decayed_at else None,
+        }
+
+    def restore(self, stored: dict) -> None:
+        """Restore a histogram stored by as_stored."""
+        histogram = stored.get("histogram")
+        if not isinstance(histogram, list) or len(histogram) != len(self.histogram):
+            return
+        self.histogram = [float(weight) for weight in histogram]
+        if decayed_at := stored.get("decayed_at"):
+            self._decayed_at = datetime.fromisoformat(decayed_at)
+
+
+class StationsNameSource:
+    """Last known station names of a remote source, with its validators."""
+
+    def __init__(self) -> None:
+        """Init source."""
+        self.data: dict[str, dict] | None = None
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.content_hash: str | None = None
+
+    @property
+    def validators(self) -> tuple[str | None, str | None, str | None]:
+        """Return the ETag, Last-Modified and hash of the known body."""
+        return (self.etag, self.last_modified, self.content_hash)
+
+    def apply(self, data: dict[str, dict]) -> None:
+        """Update the known mapping with the entries which changed in data."""
+        if self.data is None:
+            self.data = data
+            return
+        removed = self.data.keys() - data.keys()
+        changed = {
+            station_id: station_data
+            for station_id, station_data in data.items()
+            if self.data.get(station_id) != station_data
+        }
+        for station_id in removed:
+            del self.data[station_id]
+        self.data.update(changed)
+        _LOGGER.debug(
+            "Station names updated: %s changed, %s removed", len(changed), len(removed)
+        )
+
+
+class StationsNameCache:
+    """Remote station names by URL, shared by tools across reloads."""
+
+    def __init__(self) -> None:
+        """Init cache."""
+        self.sources: dict[str, StationsNameSource] = {}
+
+    def get_data(self, url: str) -> dict[str, dict] | None:
+        """Return the last known station names of a source, None if unknown."""
+        source = self.sources.get(url)
+        return source.data if source is not None else None
+
+    def get_validators(self) -> dict[str, tuple]:
+        """Return the validators of every source, to detect new downloads."""
+        return {url: source.validators for url, source in self.sources.items()}
+
+    def as_dict(self) -> dict:
+        """Return the known sources, to be stored."""
+        return {
+            url: {
+                "etag": source.etag,
+                "last_modified": source.last_modified,
+                "content_hash": source.content_hash,
+                "data": source.data,
+            }
+            for url, source in self.sources.items()
+            if source.data is not None
+        }
+
+    def restore(self, stored: dict) -> None:
+        """Restore sources stored by as_dict, unless already known."""
+        for url, stored_source in stored.items():
+            if url in self.sources:
+                continue
+            self.sources[url] = source = StationsNameSource()
+            source.etag = stored_source.get("etag")
+            source.last_modified = stored_source.get("last_modified")
+            source.content_hash = stored_source.get("content_hash")
+            source.data = stored_source.get("data")
 
 
 class PrixCarburantTool:
     """Prix Carburant class with stations information."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         time_zone: str = "Europe/Paris",
         request_timeout: int = 30,
         api_ssl_check: bool = True,  # noqa: FBT001, FBT002
         session: ClientSession | None = None,
+        snapshot_mode: bool = False,  # noqa: FBT001, FBT002
+        *,
+        names_cache: StationsNameCache | None = None,
     ) -> None:
-        """Init tool."""
+        """
+        Init tool.
+
+        In snapshot mode, the whole dataset is downloaded from its bulk export
+        on each prices update, and discovery, prices and nearest stations are
+        answered from this local snapshot instead of records queries.
+
+        A names cache shared between tools avoids downloading and parsing
+        unchanged station names again, e.g. on config entry reloads.
+        """
         self._user_time_zone = time_zone
+        self._snapshot_mode = snapshot_mode
+        self._snapshot: dict[int, dict] | None = None
         self._api_ssl_check = api_ssl_check
-        self._local_stations_data: dict[str, dict] = {}
+        # remote station names, None to use the shipped index instead
+        self._osm_stations_data: dict[str, dict] | None = None
+        self._custom_stations_data: dict[str, dict] | None = None
+        self._stations_index: StationsNameIndex | None = None
+        self._search_index: StationsSearchIndex | None = None
+        self._names_cache = names_cache or StationsNameCache()
         self._stations_data: dict[str, dict] = {}
+        self._manual_station_ids: set[int] = set()
+        # (latitude, longitude, distance) of the discovered stations
+        self._discovery_area: tuple[float, float, float] | None = None
+        # (maximum distance, cadence in hours), the last one without maximum
+        self._refresh_tiers: list[tuple[float, float]] = [(float("inf"), 1)]
+        # number of the prices update which last refreshed each tier
+        self._updates_count = 0
+        self._tiers_refreshed_at: dict[int, int] = {}
+        # (station ID, area codes) of the nearest station
+        self._area_codes: tuple[int, dict] | None = None
+        self.area_statistics: dict = {}
         self._request_timeout = request_timeout
         self._session = session
-        self._semaphore = asyncio.Semaphore(_MAX_CONCURRENT_API_REQUESTS)
+        self._limiter = _AdaptiveConcurrencyLimiter()
+        self.metrics = PrixCarburantToolMetrics()
+        self.polling_schedule = AdaptivePollingSchedule(time_zone)
 
     async def async_initialize(self) -> None:
-        """Load stations name data from remote sources, falling back to local files."""
-        _LOGGER.debug("Loading OSM stations CSV from: %s", STATIONS_NAME_OSM_URL)
+        """
+        Serve station names from the names cache, else from the local index.
+
+        Nothing is downloaded or parsed: the remote sources are loaded later
+        by async_refresh_station_names.
+        """
+        self._osm_stations_data = self._names_cache.get_data(STATIONS_NAME_OSM_URL)
+        self._custom_stations_data = self._names_cache.get_data(STATIONS_NAME_URL)
+        self._search_index = None
+        if self._stations_index is None and (
+            self._osm_stations_data is None or self._custom_stations_data is None
+        ):
+            try:
+                with self.metrics.measure("local_index"):
+                    self._stations_index = await asyncio.to_thread(
+                        StationsNameIndex, Path(__file__).parent / STATIONS_INDEX_FILE
+                    )
+            except StationsIndexError:
+                _LOGGER.exception("Local station names are unavailable")
+
+    async def async_refresh_station_names(self) -> bool:
+        """
+        Load station names from remote sources, then rename known stations.
+
+        Return True if a source was downloaded again, so the names cache
+        should be stored.
+        """
+        validators = self._names_cache.get_validators()
+        self._osm_stations_data = await self._load_remote_stations_names(
+            STATIONS_NAME_OSM_URL,
+            lambda raw: parse_stations_csv(io.StringIO(raw.decode("UTF-8"))),
+            "osm",
+            decompress=bz2.decompress,
+        )
+        self._custom_stations_data = await self._load_remote_stations_names(
+            STATIONS_NAME_URL, json.loads, "github_overrides"
+        )
+        # station names may have changed, the search index is built again
+        self._search_index = None
+        for station_id, station_data in self._stations_data.items():
+            if local_station_data := self._get_local_station_data(str(station_id)):
+                _apply_local_names(station_data, local_station_data)
+        return self._names_cache.get_validators() != validators
+
+    async def _load_remote_stations_names(
+        self,
+        url: str,
+        parse: Callable[[bytes], dict[str, dict]],
+        phase: str,
+        decompress: Callable[[bytes], bytes] | None = None,
+    ) -> dict[str, dict] | None:
+        """
+        Return station names of a remote source, updating the names cache.
+
+        The download is conditional on the cached ETag and a body with the same
+        hash is not parsed again. Otherwise the body is decompressed and parsed
+        in a thread, and only the entries which changed are applied to the
+        cached mapping. On failure, the last known mapping is returned, or None
+        to use the local index.
+        """
+        source = self._names_cache.sources.setdefault(url, StationsNameSource())
+        headers = {}
+        if source.data is not None:
+            if source.etag:
+                headers[hdrs.IF_NONE_MATCH] = source.etag
+            if source.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = source.last_modified
+
+        _LOGGER.debug("Loading station names from: %s", url)
         try:
-            async with timeout(self._request_timeout):
-                response = await self._session.get(STATIONS_NAME_OSM_URL)  # type: ignore[union-attr]
-                response.raise_for_status()
-                raw = await response.read()
-            csv_content = bz2.decompress(raw).decode("UTF-8")
-            osm_stations_data: dict[str, dict] = _parse_stations_csv(csv_content)
-            _LOGGER.debug(
-                "Successfully retrieved OSM CSV from: %s", STATIONS_NAME_OSM_URL
-            )
+            with self.metrics.measure(f"{phase}_download"):
+                async with timeout(self._request_timeout):
+                    response = await self._session.get(url, headers=headers)  # type: ignore[union-attr]
+                    if response.status == HTTP_NOT_MODIFIED:
+                        response.release()
+                        _LOGGER.debug("Station names not modified: %s", url)
+                        return source.data
+                    response.raise_for_status()
+                    raw = await response.read()
+            self.metrics.bytes_received += len(raw)
+            content_hash = sha256(raw).hexdigest()
+            if source.data is None or content_hash != source.content_hash:
+                if decompress is not None:
+                    with self.metrics.measure(f"{phase}_decompress"):
+                        raw = await asyncio.to_thread(decompress, raw)
+                with self.metrics.measure(f"{phase}_parse"):
+                    source.apply(await asyncio.to_thread(parse, raw))
         except (ClientError, TimeoutError, OSError, ValueError) as err:
             _LOGGER.warning(
-                "Failed to load OSM CSV from data.gouv.fr (%s). Using local file: %s",
+                "Failed to load station names from %s (%s). Using %s",
+                url,
                 err,
-                STATIONS_NAME_OSM_FILE,
+                "last known data" if source.data is not None else STATIONS_INDEX_FILE,
             )
-            with (Path(__file__).parent / STATIONS_NAME_OSM_FILE).open(
-                encoding="UTF-8",
-            ) as file:
-                osm_stations_data = _parse_stations_csv(file.read())
+            return source.data
 
-        _LOGGER.debug("Loading custom stations from: %s", STATIONS_NAME_URL)
-        try:
-            async with timeout(self._request_timeout):
-                response = await self._session.get(STATIONS_NAME_URL)  # type: ignore[union-attr]
-                response.raise_for_status()
-                custom_stations_data: dict[str, dict] = await response.json(
-                    content_type=None
+        source.etag = response.headers.get(hdrs.ETAG)
+        source.last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+        source.content_hash = content_hash
+        _LOGGER.debug("Successfully retrieved station names from: %s", url)
+        return source.data
+
+    def _get_local_station_data(self, station_id: str) -> dict | None:
+        """Return name data of a station, custom data taking precedence over OSM."""
+        for remote_data, source in (
+            (self._custom_stations_data, SOURCE_CUSTOM),
+            (self._osm_stations_data, SOURCE_OSM),
+        ):
+            if remote_data is not None:
+                station_data = remote_data.get(station_id)
+            elif self._stations_index is not None:
+                station_data = self._stations_index.get(station_id, source)
+            else:
+                station_data = None
+            if station_data:
+                return station_data
+        return None
+
+    async def async_get_search_index(self) -> StationsSearchIndex:
+        """Return the search index of the known stations, built on first use."""
+        if self._search_index is None:
+            # copied in the event loop, the stations may change while building
+            sources = [
+                (list(remote_data.items()) if remote_data is not None else source)
+                for remote_data, source in (
+                    (self._osm_stations_data, SOURCE_OSM),
+                    (self._custom_stations_data, SOURCE_CUSTOM),
                 )
-            _LOGGER.debug(
-                "Successfully retrieved custom data from: %s", STATIONS_NAME_URL
-            )
-        except (ClientError, TimeoutError, json.JSONDecodeError, ValueError) as err:
-            _LOGGER.warning(
-                "Failed to load custom stations data from GitHub (%s). Using local file: %s",
-                err,
-                STATIONS_NAME_FILE,
-            )
-            with (Path(__file__).parent / STATIONS_NAME_FILE).open(
-                encoding="UTF-8",
-            ) as file:
-                custom_stations_data = json.load(file)
+            ]
+            records = list((self._snapshot or {}).values())
+            stations = list(self._stations_data.items())
+            with self.metrics.measure("search_index"):
+                self._search_index = await asyncio.to_thread(
+                    self._build_search_index, sources, records, stations
+                )
+        return self._search_index
+
+    def _build_search_index(
+        self,
+        sources: list[list[tuple[str, dict]] | str],
+        records: list[dict],
+        stations: list[tuple[int, dict]],
+    ) -> StationsSearchIndex:
+        """
+        Build the search index from station names, custom ones taking precedence.
 
-        self._local_stations_data = {**osm_stations_data, **custom_stations_data}
+        Cities and postal codes are only known for the stations of the snapshot
+        and the stations of the entry, the other ones are found by the postal
+        code prefix of their ID.
+        """
+        fields = (ATTR_NAME, ATTR_BRAND, ATTR_CITY, ATTR_POSTAL_CODE)
+        entries: dict[str, dict] = {}
+        for source in sources:
+            if isinstance(source, str):
+                if self._stations_index is None:
+                    continue
+                source = self._stations_index.items(source)  # noqa: PLW2901
+            for station_id, station_data in source:
+                entries[station_id] = {key: station_data.get(key) for key in fields}
+        for record in records:
+            entry = entries.setdefault(str(record["id"]), {})
+            entry[ATTR_CITY] = entry.get(ATTR_CITY) or record.get("ville")
+            entry[ATTR_POSTAL_CODE] = entry.get(ATTR_POSTAL_CODE) or record.get("cp")
+        for station_id, station_data in stations:
+            entries[str(station_id)] = {key: station_data[key] for key in fields}
+            if station_data[ATTR_NAME] == "undefined":
+                entries[str(station_id)][ATTR_NAME] = None
+        return StationsSearchIndex(entries.items())
 
     @property
     def stations(self) -> dict:
         """Return stations information."""
         return self._stations_data
 
+    @property
+    def concurrency_limit(self) -> int:
+        """Return the current limit of concurrent API requests."""
+        return self._limiter.limit
+
     async def request_api(
         self,
         params: dict,
@@ -158,6 +733,9 @@ class PrixCarburantTool:
         )
         last_exception: Exception | None = None
         for attempt in range(1, retries + 1):
+            self.metrics.requests += 1
+            await self._limiter.acquire()
+            start = time.perf_counter()
             try:
                 async with timeout(self._request_timeout):
                     response = await self._session.request(  # type: ignore[union-attr]
@@ -166,24 +744,47 @@ class PrixCarburantTool:
                         params=params,
                         ssl=self._api_ssl_check,
                     )
-                    content = await response.json()
+                    body = await response.read()
 
-                    if response.status == HTTP_OK and "results" in content:
-                        response.close()
-                        return content
-
-                    _raise_api_request_error(response.status, content)
+                    # checked before decoding: proxies answer overloads in HTML
+                    if (
+                        response.status == HTTP_TOO_MANY_REQUESTS
+                        or response.status >= HTTP_INTERNAL_SERVER_ERROR
+                    ):
+                        # overloaded API: back off and retry
+                        self._limiter.on_congestion(start)
+                        self.metrics.errors += 1
+                        last_exception = PrixCarburantToolRequestError(
+                            f"API request error {response.status}: "
+                            f"{body[:_ERROR_BODY_LENGTH].decode(errors='replace')}"
+                        )
+                    else:
+                        content = json.loads(body)
+                        if response.status == HTTP_OK and "results" in content:
+                            response.close()
+                            duration = time.perf_counter() - start
+                            self.metrics.record_request(duration, len(body))
+                            self._limiter.on_success(duration)
+                            return content
+                        _raise_api_request_error(response.status, content)
 
             except TimeoutError:
                 msg = "Timeout occurred while connecting to Prix Carburant API."
                 last_exception = PrixCarburantToolCannotConnectError(msg)
-            except ClientError, gaierror:
+                self.metrics.timeouts += 1
+                self._limiter.on_congestion(start)
+            except ClientError, gaierror, ValueError:
                 msg = "Error occurred while communicating with the Prix Carburant API."
                 last_exception = PrixCarburantToolCannotConnectError(msg)
+                self.metrics.errors += 1
             except PrixCarburantToolRequestError:
+                self.metrics.errors += 1
                 raise
+            finally:
+                await self._limiter.release()
 
             if attempt < retries:
+                self.metrics.retries += 1
                 _LOGGER.warning(
                     "API request failed (attempt %s/%s), retrying in %ss",
                     attempt,
@@ -196,30 +797,109 @@ class PrixCarburantTool:
             raise last_exception
         return {}
 
-    async def _fetch_stations_by_ids(
+    async def refresh_snapshot(self) -> None:
+        """Download the national snapshot of stations from the dataset export."""
+        _LOGGER.debug("Call %s to download the dataset", PRIX_CARBURANT_EXPORT_URL)
+        snapshot: dict[int, dict] = {}
+        size = 0
+        self.metrics.requests += 1
+        start = time.perf_counter()
+        try:
+            async with timeout(self._request_timeout):
+                with self.metrics.span("snapshot_download"):
+                    response = await self._session.get(  # type: ignore[union-attr]
+                        PRIX_CARBURANT_EXPORT_URL,
+                        params={
+                            "select": _SNAPSHOT_SELECT,
+                            "lang": "fr",
+                            "timezone": self._user_time_zone,
+                        },
+                        ssl=self._api_ssl_check,
+                    )
+                    if response.status != HTTP_OK:
+                        self.metrics.errors += 1
+                        _raise_api_request_error(response.status, await response.text())
+                    # one record per line, parsed while downloading
+                    async for line in response.content:
+                        size += len(line)
+                        if line.strip():
+                            record = json.loads(line)
+                            snapshot[record["id"]] = record
+        except TimeoutError as err:
+            self.metrics.timeouts += 1
+            msg = "Timeout occurred while downloading the Prix Carburant dataset."
+            raise PrixCarburantToolCannotConnectError(msg) from err
+        except (ClientError, gaierror, ValueError, KeyError) as err:
+            self.metrics.errors += 1
+            msg = "Error occurred while downloading the Prix Carburant dataset."
+            raise PrixCarburantToolCannotConnectError(msg) from err
+
+        self.metrics.record_request(time.perf_counter() - start, size)
+        self._snapshot = snapshot
+        _LOGGER.debug("%s stations in the dataset snapshot", len(snapshot))
+
+    async def _get_snapshot(self) -> dict[int, dict]:
+        """Return the national snapshot, downloading it if not done yet."""
+        if self._snapshot is None:
+            await self.refresh_snapshot()
+        return self._snapshot  # type: ignore[return-value]
+
+    async def _get_snapshot_records_within(
+        self, latitude: float, longitude: float, distance: float
+    ) -> list[dict]:
+        """Return records of the snapshot within a distance of a location."""
+        records = []
+        for record in (await self._get_snapshot()).values():
+            try:
+                record_distance = _get_distance(
+                    float(record["longitude"]) / 100000,
+                    float(record["latitude"]) / 100000,
+                    longitude,
+                    latitude,
+                )
+            except KeyError, TypeError, ValueError:
+                continue
+            if record_distance <= distance:
+                records.append(record)
+        return records
+
+    async def fetch_stations_by_ids(
         self, station_ids: list, latitude: float, longitude: float
     ) -> tuple[dict, list[str]]:
         """Fetch station data for the given IDs, returning (data, missing_ids)."""
         if not station_ids:
             return {}, []
 
-        ids_list = ",".join(str(sid) for sid in station_ids)
-        query_limit = min(len(station_ids), 100)
-        response = await self.request_api(
-            {
-                "select": "id,latitude,longitude,cp,adresse,ville",  # codespell:ignore-words-list=adresse
-                "where": f"id IN ({ids_list})",
-                "limit": query_limit,
-            }
-        )
+        if self._snapshot_mode:
+            snapshot = await self._get_snapshot()
+            results = [
+                snapshot[int(sid)] for sid in station_ids if int(sid) in snapshot
+            ]
+        else:
+            responses = await asyncio.gather(
+                *[
+                    self.request_api(
+                        {
+                            "select": "id,latitude,longitude,cp,adresse,ville",  # codespell:ignore-words-list=adresse
+                            "where": f"id IN ({','.join(str(sid) for sid in chunk)})",
+                            "limit": len(chunk),
+                        }
+                    )
+                    for chunk in _chunks(station_ids)
+                ]
+            )
+            results = [
+                result for response in responses for result in response["results"]
+            ]
 
-        api_station_ids = {str(r["id"]) for r in response.get("results", [])}
+        api_station_ids = {str(r["id"]) for r in results}
         missing_ids = [
             str(sid) for sid in station_ids if str(sid) not in api_station_ids
         ]
+        self.metrics.stations_missing += len(missing_ids)
 
         data: dict = {}
-        for result in response.get("results", []):
+        for result in results:
             data.update(
                 self._build_station_data(
                     result,
@@ -238,7 +918,7 @@ class PrixCarburantTool:
             self._stations_data = {}
             return
 
-        data, missing_ids = await self._fetch_stations_by_ids(
+        data, missing_ids = await self.fetch_stations_by_ids(
             stations_ids, latitude, longitude
         )
         for sid in missing_ids:
@@ -255,59 +935,170 @@ class PrixCarburantTool:
         distance: int,
     ) -> None:
         """Get data from near stations."""
+        self._stations_data = {}
+        self._discovery_area = (latitude, longitude, distance)
+        if self._snapshot_mode:
+            await self._add_snapshot_stations_within(distance)
+            _LOGGER.debug("%s stations found in the snapshot", len(self._stations_data))
+            return
+
         _LOGGER.debug("Call %s API to retrieve station data", PRIX_CARBURANT_API_URL)
-        response_count = await self.request_api(
-            {
-                "select": "id",
-                "where": f"distance(geom, geom'POINT({longitude} {latitude})', {distance}km)",
-                "limit": 1,
-            }
+        await self._discover_tile(
+            _get_distance_clause(latitude, longitude, distance),
+            (latitude, longitude, distance),
         )
-        stations_count = response_count["total_count"]
-        _LOGGER.debug("%s stations returned by the API", stations_count)
+        _LOGGER.debug("%s stations returned by the API", len(self._stations_data))
 
-        async def _fetch_page(query_offset: int, query_limit: int) -> dict:
-            _LOGGER.debug(
-                "Query stations from %s to %s/%s",
-                query_offset,
-                query_limit,
-                stations_count,
+    async def update_discovery_distance(self, distance: float) -> None:
+        """
+        Change the distance of discovered stations without discovering again.
+
+        A larger distance only requests the stations between both circles, and
+        their prices. A smaller one drops the stations beyond it, except manual
+        ones, without any request.
+        """
+        if self._discovery_area is None:
+            return
+        latitude, longitude, previous_distance = self._discovery_area
+        self._discovery_area = (latitude, longitude, distance)
+        if distance < previous_distance:
+            for station_id, station_data in list(self._stations_data.items()):
+                if (
+                    station_id not in self._manual_station_ids
+                    and (station_data[ATTR_DISTANCE] or 0) > distance
+                ):
+                    del self._stations_data[station_id]
+            return
+        if distance == previous_distance:
+            return
+
+        known_station_ids = set(self._stations_data)
+        if self._snapshot_mode:
+            await self._add_snapshot_stations_within(distance)
+        else:
+            await self._discover_tile(
+                f"{_get_distance_clause(latitude, longitude, distance)} AND NOT "
+                f"{_get_distance_clause(latitude, longitude, previous_distance)}",
+                (latitude, longitude, distance),
             )
-            async with self._semaphore:
-                response = await self.request_api(
-                    {
-                        "select": "id,latitude,longitude,cp,adresse,ville",  # codespell:ignore-words-list=adresse
-                        "where": f"distance(geom, geom'POINT({longitude} {latitude})', {distance}km)",
-                        "offset": query_offset,
-                        "limit": query_limit,
-                    }
-                )
-            data: dict = {}
-            for station in response["results"]:
-                data.update(
+        new_station_ids = [
+            station_id
+            for station_id in self._stations_data
+            if station_id not in known_station_ids
+        ]
+        _LOGGER.debug(
+            "%s stations found between %s and %s km",
+            len(new_station_ids),
+            previous_distance,
+            distance,
+        )
+        await self._update_prices_of(new_station_ids)
+
+    async def _add_snapshot_stations_within(self, distance: float) -> None:
+        """Add stations of the snapshot within a distance of the discovery area."""
+        latitude, longitude, _ = self._discovery_area  # type: ignore[misc]
+        for record in await self._get_snapshot_records_within(
+            latitude, longitude, distance
+        ):
+            if record["id"] not in self._stations_data:
+                self._stations_data.update(
                     self._build_station_data(
-                        station, user_longitude=longitude, user_latitude=latitude
+                        record, user_longitude=longitude, user_latitude=latitude
                     )
                 )
-            return data
 
-        offsets_limits = [
-            (offset, min(100, stations_count - offset))
-            for offset in range(0, stations_count, 100)
-        ]
-        results = await asyncio.gather(
-            *[_fetch_page(off, lim) for off, lim in offsets_limits],
+    async def _discover_tile(
+        self,
+        where_clause: str,
+        area: tuple[float, float, float],
+        bbox: tuple[float, float, float, float] | None = None,
+        depth: int = 0,
+    ) -> None:
+        """
+        Add stations matching the where clause within a tile to stations data.
+
+        The first page also gives the number of stations in the tile. Small
+        tiles are paged by offset in one round trip, larger ones are split in 4
+        tiles queried concurrently, so deep offsets and the API offset window
+        are avoided.
+        Stations on tile borders are deduplicated by their ID.
+
+        The area is the (latitude, longitude, distance) discovery circle, and
+        the bbox the (south, west, north, east) tile within it.
+        """
+        latitude, longitude, distance = area
+        tile_where_clause = where_clause
+        if bbox is not None:
+            south, west, north, east = bbox
+            tile_where_clause = (
+                f"{where_clause} AND in_bbox(geom, "
+                f"{north:.6f}, {west:.6f}, {south:.6f}, {east:.6f})"
+            )
+
+        async def _fetch_page(query_offset: int) -> int:
+            """Add a page of stations to stations data, return the stations count."""
+            response = await self.request_api(
+                {
+                    "select": "id,latitude,longitude,cp,adresse,ville",  # codespell:ignore-words-list=adresse
+                    "where": tile_where_clause,
+                    "offset": query_offset,
+                    "limit": _API_PAGE_SIZE,
+                }
+            )
+            for station in response["results"]:
+                # stations already known keep their data and prices
+                if station["id"] not in self._stations_data:
+                    self._stations_data.update(
+                        self._build_station_data(
+                            station, user_longitude=longitude, user_latitude=latitude
+                        )
+                    )
+            return response["total_count"]
+
+        # only the root tile is traced, tiles below run concurrently
+        with self.metrics.span("discovery_count") if bbox is None else nullcontext():
+            stations_count = await _fetch_page(0)
+        _LOGGER.debug(
+            "%s stations in discovery tile %s (depth %s)", stations_count, bbox, depth
         )
-        data: dict = {}
-        for result in results:
-            data.update(result)
-        self._stations_data = data
+        if stations_count <= _API_PAGE_SIZE:
+            return
+
+        with self.metrics.span("discovery_pages") if bbox is None else nullcontext():
+            if stations_count <= _TILE_MAX_STATIONS or depth >= _TILE_MAX_DEPTH:
+                await asyncio.gather(
+                    *[
+                        _fetch_page(offset)
+                        for offset in range(
+                            _API_PAGE_SIZE, stations_count, _API_PAGE_SIZE
+                        )
+                    ],
+                )
+                return
+
+            if bbox is None:
+                latitude_delta = distance * _ROOT_TILE_MARGIN / _KM_PER_LATITUDE_DEGREE
+                longitude_delta = latitude_delta / cos(radians(latitude))
+                bbox = (
+                    latitude - latitude_delta,
+                    longitude - longitude_delta,
+                    latitude + latitude_delta,
+                    longitude + longitude_delta,
+                )
+            await asyncio.gather(
+                *[
+                    self._discover_tile(where_clause, area, quadrant, depth + 1)
+                    for quadrant in _split_bbox(bbox)
+                    if _get_bbox_distance(quadrant, longitude, latitude) <= distance
+                ],
+            )
 
     async def add_manual_stations(
         self, manual_station_ids: list[int], latitude: float, longitude: float
     ) -> None:
         """Add manual stations to existing stations data without overwriting."""
         _LOGGER.debug("Adding %s manual stations", len(manual_station_ids))
+        self._manual_station_ids.update(int(sid) for sid in manual_station_ids)
 
         new_ids = [
             sid for sid in manual_station_ids if int(sid) not in self._stations_data
@@ -318,7 +1109,7 @@ class PrixCarburantTool:
             )
             return
 
-        data, missing_ids = await self._fetch_stations_by_ids(
+        data, missing_ids = await self.fetch_stations_by_ids(
             new_ids, latitude, longitude
         )
         for sid in missing_ids:
@@ -330,57 +1121,202 @@ class PrixCarburantTool:
             "Manual stations added. Total stations: %s", len(self._stations_data)
         )
 
+    def remove_manual_stations(self, station_ids: list[int]) -> None:
+        """Remove manual stations, unless they are within the discovery distance."""
+        distance = self._discovery_area[2] if self._discovery_area else 0
+        for station_id in station_ids:
+            self._manual_station_ids.discard(station_id)
+            station_data = self._stations_data.get(station_id)
+            if station_data and (station_data[ATTR_DISTANCE] or 0) > distance:
+                del self._stations_data[station_id]
+
+    def set_request_options(self, *, api_ssl_check: bool, snapshot_mode: bool) -> None:
+        """Change how data is requested, from the next request on."""
+        self._api_ssl_check = api_ssl_check
+        if not snapshot_mode:
+            self._snapshot = None
+        self._snapshot_mode = snapshot_mode
+
+    def set_refresh_tiers(
+        self, tiers: list[tuple[float, float]], default_cadence: float
+    ) -> None:
+        """
+        Set the refresh cadence in hours of stations by distance.
+
+        Stations farther than every tier are refreshed every default cadence.
+        Cadences are counted in prices updates, made every shortest cadence:
+        a tier of twice the shortest cadence is refreshed every other update,
+        whatever the actual delay between updates (e.g. adaptive polling).
+        Every tier is refreshed on the next update.
+        """
+        self._refresh_tiers = [*sorted(tiers), (float("inf"), default_cadence)]
+        self._tiers_refreshed_at = {}
+
+    @property
+    def refresh_cadence(self) -> float:
+        """Return the shortest refresh cadence in hours."""
+        return min(cadence for _distance, cadence in self._refresh_tiers)
+
+    def expire_refresh_tiers(self) -> None:
+        """Refresh every tier on the next update."""
+        self._tiers_refreshed_at = {}
+
+    def _get_due_tiers(self, update: int) -> set[int]:
+        """Return the tiers whose cadence in updates elapsed since their refresh."""
+        shortest_cadence = self.refresh_cadence
+        return {
+            tier
+            for tier, (_distance, cadence) in enumerate(self._refresh_tiers)
+            if (refreshed_at := self._tiers_refreshed_at.get(tier)) is None
+            or update - refreshed_at >= max(1, round(cadence / shortest_cadence))
+        }
+
+    def _get_station_tier(self, station_data: dict) -> int:
+        """Return the refresh tier of a station, the first one without distance."""
+        distance = station_data[ATTR_DISTANCE] or 0
+        return next(
+            tier
+            for tier, (max_distance, _cadence) in enumerate(self._refresh_tiers)
+            if distance <= max_distance
+        )
+
+    async def add_stations(self, stations_data: dict) -> None:
+        """Add already fetched manual stations, then request their prices only."""
+        self._stations_data.update(stations_data)
+        self._manual_station_ids.update(stations_data)
+        await self._update_prices_of(list(stations_data))
+
+    async def _update_prices_of(self, station_ids: list) -> None:
+        """Update prices of some stations only, outside of a refresh."""
+        if not station_ids:
+            return
+        if self._snapshot_mode:
+            results_by_id = await self._get_snapshot()
+        elif (results_by_id := await self._request_prices(station_ids)) is None:
+            return
+        self._apply_prices(station_ids, results_by_id)
+
     async def update_stations_prices(self) -> None:
         """Update prices of specified stations."""
+        total_stations = len(self._stations_data)
+        if total_stations == 0:
+            return
+
+        # the snapshot has every station, tiers only save records queries
+        self._updates_count += 1
+        update = self._updates_count
+        due_tiers = (
+            set(range(len(self._refresh_tiers)))
+            if self._snapshot_mode
+            else self._get_due_tiers(update)
+        )
+        station_ids = [
+            station_id
+            for station_id, station_data in self._stations_data.items()
+            if self._get_station_tier(station_data) in due_tiers
+        ]
+        if not station_ids:
+            return
+        _LOGGER.debug(
+            "Update prices of %s/%s station(s) in tiers %s",
+            len(station_ids),
+            total_stations,
+            sorted(due_tiers),
+        )
+        start = time.perf_counter()
+        if self._snapshot_mode:
+            try:
+                await self.refresh_snapshot()
+            except PrixCarburantToolCannotConnectError:
+                _LOGGER.exception("Failed to update prices from the dataset")
+                self.metrics.record_refresh_failure(time.perf_counter() - start)
+                return
+            results_by_id = self._snapshot
+        elif (results_by_id := await self._request_prices(station_ids)) is None:
+            self.metrics.record_refresh_failure(time.perf_counter() - start)
+            return
+
+        failed_stations = self._apply_prices(station_ids, results_by_id)  # type: ignore[arg-type]
+        self._tiers_refreshed_at.update(dict.fromkeys(due_tiers, update))
+
+        self.metrics.record_refresh(time.perf_counter() - start, failed_stations)
+        if failed_stations:
+            _LOGGER.warning(
+                "%s/%s station(s) returned no data from the API: %s",
+                len(failed_stations),
+                len(station_ids),
+                ", ".join(failed_stations),
+            )
+
+    async def _request_prices(self, station_ids: list) -> dict | None:
+        """Request prices of stations from the API, None if every request failed."""
         _LOGGER.debug("Call %s API to retrieve fuel prices", PRIX_CARBURANT_API_URL)
         query_select = "id," + ",".join(
             f"{fuel.lower()}_{suffix}"
             for suffix in ("prix", "maj", "rupture_debut", "rupture_type")
             for fuel in FUELS
         )
-        total_stations = len(self._stations_data)
-        if total_stations == 0:
-            return
-
-        station_ids = list(self._stations_data.keys())
-        ids_list = ",".join(str(sid) for sid in station_ids)
-        where_clause = f"id IN ({ids_list})"
-        query_limit = min(total_stations, 100)
+        chunks = _chunks(station_ids)
+        responses = await asyncio.gather(
+            *[
+                self.request_api(
+                    {
+                        "select": query_select,
+                        "where": f"id IN ({','.join(str(sid) for sid in chunk)})",
+                        "limit": len(chunk),
+                    }
+                )
+                for chunk in chunks
+            ],
+            return_exceptions=True,
+        )
+        results_by_id: dict = {}
+        failed_chunks = 0
+        for chunk, response in zip(chunks, responses, strict=True):
+            if isinstance(
+                response,
+                PrixCarburantToolCannotConnectError | PrixCarburantToolRequestError,
+            ):
+                failed_chunks += 1
+                _LOGGER.error(
+                    "Failed to update prices of %s station(s) from API: %s",
+                    len(chunk),
+                    response,
+                )
+                continue
+            if isinstance(response, BaseException):
+                raise response
+            results_by_id.update((r["id"], r) for r in response["results"])
 
-        try:
-            response = await self.request_api(
-                {
-                    "select": query_select,
-                    "where": where_clause,
-                    "limit": query_limit,
-                }
-            )
-        except (
-            PrixCarburantToolCannotConnectError,
-            PrixCarburantToolRequestError,
-        ):
-            _LOGGER.exception("Failed to update prices from API")
-            return
+        if failed_chunks == len(chunks):
+            return None
+        return results_by_id
 
-        api_station_ids = {r["id"] for r in response.get("results", [])}
+    def _apply_prices(self, station_ids: list, results_by_id: dict) -> list[str]:
+        """Update fuels of stations from price records, return stations without."""
         failed_stations: list[str] = []
-
+        updated_dates: list[str] = []
         for station_id_ in station_ids:
-            if station_id_ not in api_station_ids:
+            if (result := results_by_id.get(station_id_)) is None:
                 failed_stations.append(str(station_id_))
                 continue
             station_data = self._stations_data[station_id_]
-            result = next(r for r in response["results"] if r["id"] == station_id_)
             for fuel in FUELS:
                 fuel_key = fuel.lower()
                 if (
                     result.get(f"{fuel_key}_prix")
                     or result.get(f"{fuel_key}_rupture_type") == "temporaire"
                 ):
+                    updated_date = result.get(f"{fuel_key}_maj")
+                    previous = station_data[ATTR_FUELS].get(fuel)
+                    if updated_date and (
+                        previous is None or previous[ATTR_UPDATED_DATE] != updated_date
+                    ):
+                        updated_dates.append(updated_date)
                     station_data[ATTR_FUELS].update(
                         {
                             fuel: {
-                                ATTR_UPDATED_DATE: result.get(f"{fuel_key}_maj"),
+                                ATTR_UPDATED_DATE: updated_date,
                                 ATTR_PRICE: result.get(f"{fuel_key}_prix"),
                                 ATTR_SHORTAGE_SINCE: result.get(
                                     f"{fuel_key}_rupture_debut"
@@ -390,20 +1326,124 @@ class PrixCarburantTool:
                     )
                 else:
                     station_data[ATTR_FUELS].pop(fuel, None)
+        self.polling_schedule.record_updates(updated_dates)
+        return failed_stations
 
-        if failed_stations:
-            _LOGGER.warning(
-                "%s/%s station(s) returned no data from the API: %s",
-                len(failed_stations),
-                total_stations,
-                ", ".join(failed_stations),
+    async def update_area_statistics(self, area: str) -> None:
+        """
+        Update fuel price statistics of the department or region of the home.
+
+        The area is the one of the nearest station. The API aggregates prices
+        in a single response of one row; in snapshot mode they are computed
+        from the local snapshot. Statistics are kept on failure.
+        """
+        field = _AREA_FIELDS[area]
+        try:
+            if (codes := await self._get_area_codes()) is None or not (
+                code := codes.get(field)
+            ):
+                self.area_statistics = {}
+                return
+            if self._snapshot_mode:
+                fuels = _get_area_statistics(
+                    (await self._get_snapshot()).values(), field, code
+                )
+            else:
+                fuels = await self._request_area_statistics(field, code)
+        except (
+            PrixCarburantToolCannotConnectError,
+            PrixCarburantToolRequestError,
+        ):
+            _LOGGER.exception("Failed to update the %s statistics", area)
+            return
+        self.area_statistics = {
+            ATTR_AREA: area,
+            ATTR_AREA_CODE: code,
+            ATTR_FUELS: fuels,
+        }
+
+    async def _get_area_codes(self) -> dict | None:
+        """Return the department and region codes of the nearest station."""
+        if not self._stations_data:
+            return None
+        station_id = min(
+            self._stations_data,
+            key=lambda station_id: self._stations_data[station_id][ATTR_DISTANCE] or 0,
+        )
+        if self._area_codes is None or self._area_codes[0] != station_id:
+            if self._snapshot_mode:
+                record = (await self._get_snapshot()).get(station_id) or {}
+            else:
+                response = await self.request_api(
+                    {
+                        "select": ",".join(_AREA_FIELDS.values()),
+                        "where": f"id={station_id}",
+                        "limit": 1,
+                    }
+                )
+                record = next(iter(response["results"]), {})
+            self._area_codes = (
+                station_id,
+                {field: record.get(field) for field in _AREA_FIELDS.values()},
             )
+        return self._area_codes[1]
+
+    async def _request_area_statistics(self, field: str, code: str) -> dict:
+        """Request price statistics of an area aggregated by the API."""
+        _LOGGER.debug(
+            "Call %s API to aggregate prices of %s", PRIX_CARBURANT_API_URL, code
+        )
+        response = await self.request_api(
+            {
+                "select": ",".join(
+                    f"{function}({fuel.lower()}_prix) as {fuel.lower()}_{function}"
+                    for fuel in FUELS
+                    for function in ("avg", "min", "max", "count")
+                ),
+                "where": f'{field}="{code}"',
+                "group_by": field,
+                "limit": 1,
+            }
+        )
+        row = next(iter(response["results"]), {})
+        statistics = {}
+        for fuel in FUELS:
+            fuel_key = fuel.lower()
+            if row.get(f"{fuel_key}_count"):
+                statistics[fuel] = {
+                    ATTR_PRICE: round(row[f"{fuel_key}_avg"], 3),
+                    ATTR_MIN_PRICE: row[f"{fuel_key}_min"],
+                    ATTR_MAX_PRICE: row[f"{fuel_key}_max"],
+                    ATTR_STATIONS_COUNT: row[f"{fuel_key}_count"],
+                }
+        return statistics
 
     async def find_nearest_station(
         self, longitude: float, latitude: float, fuel: str, distance: int = 10
     ) -> dict:
         """Return stations near the location where the fuel price is the lowest."""
         data = {}
+        fuel_key = f"{fuel.lower()}_prix"
+        if self._snapshot_mode:
+            records = [
+                record
+                for record in await self._get_snapshot_records_within(
+                    latitude, longitude, distance
+                )
+                if record.get(fuel_key) is not None
+            ]
+            records.sort(key=lambda record: record[fuel_key])
+            for station in records[:10]:
+                data.update(
+                    self._build_station_data(
+                        station,
+                        user_longitude=longitude,
+                        user_latitude=latitude,
+                        fuel_key=fuel_key,
+                    )
+                )
+            return data
+
         _LOGGER.debug(
             "Call %s API to retrieve nearest stations ordered by price",
             PRIX_CARBURANT_API_URL,
@@ -433,6 +1473,70 @@ class PrixCarburantTool:
             )
         return data
 
+    async def find_cheapest_stations_by_fuel(
+        self,
+        longitude: float,
+        latitude: float,
+        fuels: list[str],
+        distance: float = 10,
+        limit: int = 10,
+    ) -> dict[str, dict]:
+        """
+        Return, for each fuel, the stations near the location with lowest prices.
+
+        The API ranks the stations of each fuel, one query per fuel, so the
+        records of large areas are never paged past the API offset window.
+        """
+        if self._snapshot_mode:
+            records = await self._get_snapshot_records_within(
+                latitude, longitude, distance
+            )
+            records_by_fuel = [records] * len(fuels)
+        else:
+            records_by_fuel = await asyncio.gather(
+                *(
+                    self._request_cheapest_records(
+                        latitude, longitude, distance, fuel, limit
+                    )
+                    for fuel in fuels
+                )
+            )
+
+        stations_by_fuel: dict[str, dict] = {}
+        for fuel, records in zip(fuels, records_by_fuel, strict=True):
+            fuel_key = f"{fuel.lower()}_prix"
+            stations_by_fuel[fuel] = {}
+            for station in heapq.nsmallest(
+                limit,
+                (record for record in records if record.get(fuel_key) is not None),
+                key=itemgetter(fuel_key),
+            ):
+                stations_by_fuel[fuel].update(
+                    self._build_station_data(
+                        station,
+                        user_longitude=longitude,
+                        user_latitude=latitude,
+                        fuel_key=fuel_key,
+                    )
+                )
+        return stations_by_fuel
+
+    async def _request_cheapest_records(
+        self, latitude: float, longitude: float, distance: float, fuel: str, limit: int
+    ) -> list[dict]:
+        """Request the stations within a distance with the lowest fuel price."""
+        response = await self.request_api(
+            {
+                "select": "id,latitude,longitude,cp,adresse,ville,"  # codespell:ignore-words-list=adresse
+                f"{fuel.lower()}_prix",
+                "where": f"{_get_distance_clause(latitude, longitude, distance)} "
+                f"AND {fuel.lower()}_prix IS NOT NULL",
+                "order_by": f"{fuel.lower()}_prix",
+                "limit": limit,
+            }
+        )
+        return response["results"]
+
     def _build_station_data(
         self,
         station: dict,
@@ -470,16 +1574,9 @@ class PrixCarburantTool:
             if fuel_key:
                 data[station["id"]][ATTR_PRICE] = station[fuel_key]
             # update station data with local data if existing in it
-            if local_station_data := self._local_stations_data.get(str(station["id"])):
-                for attr_key in (
-                    ATTR_NAME,
-                    ATTR_BRAND,
-                    ATTR_ADDRESS,
-                    ATTR_POSTAL_CODE,
-                    ATTR_CITY,
-                ):
-                    if attr_value := local_station_data.get(attr_key):
-                        data[station["id"]][attr_key] = normalize_string(attr_value)
+            if local_station_data := self._get_local_station_data(str(station["id"])):
+                self.metrics.local_data_hits += 1
+                _apply_local_names(data[station["id"]], local_station_data)
                 # allow overriding GPS coordinates (decimal degrees)
                 if (override_lat := local_station_data.get("latitude")) is not None:
                     data[station["id"]][ATTR_LATITUDE] = float(override_lat)
@@ -499,6 +1596,8 @@ class PrixCarburantTool:
                         user_longitude,
                         user_latitude,
                     )
+            else:
+                self.metrics.local_data_misses += 1
         except KeyError, TypeError:
             _LOGGER.exception(
                 "Error while getting station %s information",
@@ -507,16 +1606,104 @@ class PrixCarburantTool:
         return data
 
 
+def _apply_local_names(station_data: dict, local_station_data: dict) -> None:
+    """Update the name and address of a station from its local name data."""
+    for attr_key in (ATTR_NAME, ATTR_BRAND, ATTR_ADDRESS, ATTR_POSTAL_CODE, ATTR_CITY):
+        if attr_value := local_station_data.get(attr_key):
+            station_data[attr_key] = normalize_string(attr_value)
+
+
+def _get_area_statistics(records: Iterable[dict], field: str, code: str) -> dict:
+    """Compute price statistics of an area from records, one column per fuel."""
+    area_records = [record for record in records if record.get(field) == code]
+    statistics = {}
+    for fuel in FUELS:
+        fuel_key = f"{fuel.lower()}_prix"
+        if prices := [
+            record[fuel_key]
+            for record in area_records
+            if record.get(fuel_key) is not None
+        ]:
+            statistics[fuel] = {
+                ATTR_PRICE: round(fsum(prices) / len(prices), 3),
+                ATTR_MIN_PRICE: min(prices),
+                ATTR_MAX_PRICE: max(prices),
+                ATTR_STATIONS_COUNT: len(prices),
+            }
+    return statistics
+
+
+def parse_refresh_tiers(text: str) -> list[tuple[float, float]]:
+    """
+    Parse refresh tiers like "5:1, 15:4" (km:hours), raise ValueError if invalid.
+
+    An empty text has no tiers.
+    """
+    tiers: list[tuple[float, float]] = []
+    for raw_tier in text.replace(";", ",").split(","):
+        if not raw_tier.strip():
+            continue
+        distance, separator, cadence = raw_tier.partition(":")
+        if not separator:
+            msg = f"Refresh tier {raw_tier.strip()} is not km:hours"
+            raise ValueError(msg)
+        tier = (float(distance), float(cadence))
+        if not all(value > 0 for value in tier):
+            msg = f"Refresh tier {raw_tier.strip()} is not positive"
+            raise ValueError(msg)
+        tiers.append(tier)
+    return sorted(tiers)
+
+
 def _raise_api_request_error(status: int, body: object) -> None:
     """Raise a PrixCarburantToolRequestError with a formatted message."""
     msg = f"API request error {status}: {body}"
     raise PrixCarburantToolRequestError(msg)
 
 
+def _get_distance_clause(latitude: float, longitude: float, distance: float) -> str:
+    """Return the where clause of stations within a distance of a location."""
+    return f"distance(geom, geom'POINT({longitude} {latitude})', {distance}km)"
+
+
+def _split_bbox(
+    bbox: tuple[float, float, float, float],
+) -> list[tuple[float, float, float, float]]:
+    """Split a (south, west, north, east) bounding box in 4 quadrants."""
+    south, west, north, east = bbox
+    middle_latitude = (south + north) / 2
+    middle_longitude = (west + east) / 2
+    return [
+        (south, west, middle_latitude, middle_longitude),
+        (south, middle_longitude, middle_latitude, east),
+        (middle_latitude, west, north, middle_longitude),
+        (middle_latitude, middle_longitude, north, east),
+    ]
+
+
+def _get_bbox_distance(
+    bbox: tuple[float, float, float, float], longitude: float, latitude: float
+) -> float:
+    """Get distance from a location to the nearest point of a bounding box."""
+    south, west, north, east = bbox
+    # not rounded, so a quadrant just within the distance is never pruned
+    return _get_haversine_distance(
+        min(max(longitude, west), east),
+        min(max(latitude, south), north),
+        longitude,
+        latitude,
+    )
+
+
 def _get_distance(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
     """Get distance from 2 locations."""
-    earth_radius = 6371
+    return round(_get_haversine_distance(lon1, lat1, lon2, lat2), 2)
 
+
+def _get_haversine_distance(
+    lon1: float, lat1: float, lon2: float, lat2: float
+) -> float:
+    """Get the exact distance in km from 2 locations."""
     # convert decimal degrees to radians
     lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
 
@@ -525,84 +1712,88 @@ def _get_distance(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
     dlat = lat2 - lat1
     calcul_a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     calcul_c = 2 * atan2(sqrt(calcul_a), sqrt(1 - calcul_a))
-    return round(calcul_c * earth_radius, 2)
+    return calcul_c * _EARTH_RADIUS_KM
 
 
+# brand -> logo file in BRAND_LOGO_BASE_URL
 _BRAND_LOGOS: dict[str, str] = {
-    "8 à Huit": BRAND_LOGO_BASE_URL + "8_A_Huit.svg",
-    "Aldi": BRAND_LOGO_BASE_URL + "Aldi_Nord.svg",
-    "Agip": BRAND_LOGO_BASE_URL + "Agip.svg",
-    "Atac": BRAND_LOGO_BASE_URL + "Atac.svg",
-    "Auchan": BRAND_LOGO_BASE_URL + "Auchan.svg",
-    "Avia": BRAND_LOGO_BASE_URL + "AVIA.svg",
-    "BP": BRAND_LOGO_BASE_URL + "BP.svg",
-    "BP Express": BRAND_LOGO_BASE_URL + "BP.svg",
-    "Bricomarché": BRAND_LOGO_BASE_URL + "Bricomarche.svg",
-    "Carrefour": BRAND_LOGO_BASE_URL + "Carrefour.svg",
-    "Carrefour Contact": BRAND_LOGO_BASE_URL + "Carrefour.svg",
-    "Carrefour Express": BRAND_LOGO_BASE_URL + "Carrefour.svg",
-    "Carrefour Market": BRAND_LOGO_BASE_URL + "Carrefour.svg",
-    "Casino": BRAND_LOGO_BASE_URL + "Casino.svg",
-    "COLRUYT": BRAND_LOGO_BASE_URL + "Colruyt.svg",
-    "CORA": BRAND_LOGO_BASE_URL + "Cora.svg",
-    "COSTCO": BRAND_LOGO_BASE_URL + "Costco.svg",
-    "Colruyt": BRAND_LOGO_BASE_URL + "Colruyt.svg",
-    "Cora": BRAND_LOGO_BASE_URL + "Cora.svg",
-    "Costco": BRAND_LOGO_BASE_URL + "Costco.svg",
-    "Dyneff": BRAND_LOGO_BASE_URL + "Dyneff.svg",
-    "ENI": BRAND_LOGO_BASE_URL + "Eni.svg",
-    "ENI FRANCE": BRAND_LOGO_BASE_URL + "Eni.svg",
-    "Elf": BRAND_LOGO_BASE_URL + "ELF.svg",
-    "Elan": BRAND_LOGO_BASE_URL + "ELAN-FR.svg",
-    "Eni": BRAND_LOGO_BASE_URL + "Eni.svg",
-    "Esso": BRAND_LOGO_BASE_URL + "Esso.svg",
-    "Esso Express": BRAND_LOGO_BASE_URL + "Esso.svg",
-    "Fulli": BRAND_LOGO_BASE_URL + "Fulli.svg",
-    "G20": BRAND_LOGO_BASE_URL + "G20.svg",
-    "Géant": BRAND_LOGO_BASE_URL + "Geant_Casino.svg",
-    "Gulf": BRAND_LOGO_BASE_URL + "Gulf.svg",
-    "Huit à 8": BRAND_LOGO_BASE_URL + "8_A_Huit.svg",
-    "Intermarché": BRAND_LOGO_BASE_URL + "Intermarche.svg",
-    "Intermarché Contact": BRAND_LOGO_BASE_URL + "Intermarche.svg",
-    "E.Leclerc": BRAND_LOGO_BASE_URL + "Leclerc.svg",
-    "LEADER-PRICE": BRAND_LOGO_BASE_URL + "Leader_Price.svg",
-    "LIDL": BRAND_LOGO_BASE_URL + "Lidl.svg",
-    "Leclerc": BRAND_LOGO_BASE_URL + "Leclerc.svg",
-    "Leader Price": BRAND_LOGO_BASE_URL + "Leader_Price.svg",
-    "Lidl": BRAND_LOGO_BASE_URL + "Lidl.svg",
-    "MIGROS": BRAND_LOGO_BASE_URL + "Migrol.svg",
-    "Maximarché": BRAND_LOGO_BASE_URL + "Maximarche.png",
-    "Monoprix": BRAND_LOGO_BASE_URL + "Monoprix.svg",
-    "PROXI SUPER": BRAND_LOGO_BASE_URL + "Proxi.svg",
-    "Netto": BRAND_LOGO_BASE_URL + "Netto-FR.svg",
-    "Proxy": BRAND_LOGO_BASE_URL + "Proxi.svg",
-    "Renault": BRAND_LOGO_BASE_URL + "Renault.svg",
-    "ROMPETROL": BRAND_LOGO_BASE_URL + "Rompetrol.svg",
-    "Roady": BRAND_LOGO_BASE_URL + "Roady-white.svg",
-    "SPAR": BRAND_LOGO_BASE_URL + "Spar.svg",
-    "SPAR STATION": BRAND_LOGO_BASE_URL + "Spar.svg",
-    "Shell": BRAND_LOGO_BASE_URL + "Shell.svg",
-    "Simply Market": BRAND_LOGO_BASE_URL + "Auchan.svg",
-    "Station U": BRAND_LOGO_BASE_URL + "Hyper-U.svg",
-    "Super Casino": BRAND_LOGO_BASE_URL + "Casino.svg",
-    "Super U": BRAND_LOGO_BASE_URL + "Hyper-U.svg",
-    "Supermarché G20": BRAND_LOGO_BASE_URL + "G20.svg",
-    "Supermarché Match": BRAND_LOGO_BASE_URL + "Match.svg",
-    "Supermarchés Spar": BRAND_LOGO_BASE_URL + "Spar.svg",
-    "Système U": BRAND_LOGO_BASE_URL + "Hyper-U.svg",
-    "Total": BRAND_LOGO_BASE_URL + "TotalEnergies.svg",
-    "Total Access": BRAND_LOGO_BASE_URL + "TotalEnergies.svg",
-    "Total Contact": BRAND_LOGO_BASE_URL + "TotalEnergies.svg",
-    "TotalEnergies": BRAND_LOGO_BASE_URL + "TotalEnergies.svg",
-    "TotalEnergies Access": BRAND_LOGO_BASE_URL + "TotalEnergies.svg",
-    "VITO": BRAND_LOGO_BASE_URL + "Vito.svg",
-    "Weldom": BRAND_LOGO_BASE_URL + "Weldom.svg",
+    "8 à Huit": "8_A_Huit.svg",
+    "Aldi": "Aldi_Nord.svg",
+    "Agip": "Agip.svg",
+    "Atac": "Atac.svg",
+    "Auchan": "Auchan.svg",
+    "Avia": "AVIA.svg",
+    "BP": "BP.svg",
+    "BP Express": "BP.svg",
+    "Bricomarché": "Bricomarche.svg",
+    "Carrefour": "Carrefour.svg",
+    "Carrefour Contact": "Carrefour.svg",
+    "Carrefour Express": "Carrefour.svg",
+    "Carrefour Market": "Carrefour.svg",
+    "Casino": "Casino.svg",
+    "COLRUYT": "Colruyt.svg",
+    "CORA": "Cora.svg",
+    "COSTCO": "Costco.svg",
+    "Colruyt": "Colruyt.svg",
+    "Cora": "Cora.svg",
+    "Costco": "Costco.svg",
+    "Dyneff": "Dyneff.svg",
+    "ENI": "Eni.svg",
+    "ENI FRANCE": "Eni.svg",
+    "Elf": "ELF.svg",
+    "Elan": "ELAN-FR.svg",
+    "Eni": "Eni.svg",
+    "Esso": "Esso.svg",
+    "Esso Express": "Esso.svg",
+    "Fulli": "Fulli.svg",
+    "G20": "G20.svg",
+    "Géant": "Geant_Casino.svg",
+    "Gulf": "Gulf.svg",
+    "Huit à 8": "8_A_Huit.svg",
+    "Intermarché": "Intermarche.svg",
+    "Intermarché Contact": "Intermarche.svg",
+    "E.Leclerc": "Leclerc.svg",
+    "LEADER-PRICE": "Leader_Price.svg",
+    "LIDL": "Lidl.svg",
+    "Leclerc": "Leclerc.svg",
+    "Leader Price": "Leader_Price.svg",
+    "Lidl": "Lidl.svg",
+    "MIGROS": "Migrol.svg",
+    "Maximarché": "Maximarche.png",
+    "Monoprix": "Monoprix.svg",
+    "PROXI SUPER": "Proxi.svg",
+    "Netto": "Netto-FR.svg",
+    "Proxy": "Proxi.svg",
+    "Renault": "Renault.svg",
+    "ROMPETROL": "Rompetrol.svg",
+    "Roady": "Roady-white.svg",
+    "SPAR": "Spar.svg",
+    "SPAR STATION": "Spar.svg",
+    "Shell": "Shell.svg",
+    "Simply Market": "Auchan.svg",
+    "Station U": "Hyper-U.svg",
+    "Super Casino": "Casino.svg",
+    "Super U": "Hyper-U.svg",
+    "Supermarché G20": "G20.svg",
+    "Supermarché Match": "Match.svg",
+    "Supermarchés Spar": "Spar.svg",
+    "Système U": "Hyper-U.svg",
+    "Total": "TotalEnergies.svg",
+    "Total Access": "TotalEnergies.svg",
+    "Total Contact": "TotalEnergies.svg",
+    "TotalEnergies": "TotalEnergies.svg",
+    "TotalEnergies Access": "TotalEnergies.svg",
+    "VITO": "Vito.svg",
+    "Weldom": "Weldom.svg",
 }
+BRAND_LOGO_FILES = frozenset(_BRAND_LOGOS.values())
 
 
 def get_entity_picture(brand: str) -> str:
-    """Get entity picture based on brand."""
-    return _BRAND_LOGOS.get(brand, "")
+    """Get entity picture based on brand, served by the local logos view."""
+    if (filename := _BRAND_LOGOS.get(brand)) is None:
+        return ""
+    return f"{BRAND_LOGOS_URL_PATH}/{filename}"
 
 
 def normalize_string(string: str | None) -> str:
@@ -0,0 +1,127 @@
+"""Local HTTP view serving cached brand logos for Prix Carburant."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mimetypes
+from asyncio import timeout
+from collections import defaultdict
+from hashlib import sha256
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError, hdrs, web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import BRAND_LOGOS_URL_PATH, DOMAIN
+from .tools import BRAND_LOGO_BASE_URL, BRAND_LOGO_FILES
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOGO_CACHE = f"{DOMAIN}_logo_cache"
+LOGO_DOWNLOAD_TIMEOUT = 30
+# logos of a given file name never change, ETag revalidates them anyway
+LOGO_MAX_AGE = 7 * 24 * 3600
+
+
+class BrandLogoCache:
+    """Brand logos downloaded once from GitHub, kept in memory and on disk."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init cache."""
+        self._hass = hass
+        self._directory = Path(hass.config.path(STORAGE_DIR, DOMAIN, "logos"))
+        self._logos: dict[str, tuple[bytes, str]] = {}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def async_get(self, filename: str) -> tuple[bytes, str] | None:
+        """Return the logo content and its ETag, None if it is unavailable."""
+        if (logo := self._logos.get(filename)) is not None:
+            return logo
+
+        # concurrent requests of a logo not cached yet download it only once
+        async with self._locks[filename]:
+            if (logo := self._logos.get(filename)) is not None:
+                return logo
+            body = await self._hass.async_add_executor_job(self._read, filename)
+            if body is None:
+                if (body := await self._download(filename)) is None:
+                    return None
+                await self._hass.async_add_executor_job(self._write, filename, body)
+            logo = (body, f'"{sha256(body).hexdigest()}"')
+            self._logos[filename] = logo
+            return logo
+
+    async def _download(self, filename: str) -> bytes | None:
+        """Download a logo from GitHub."""
+        _LOGGER.debug("Download brand logo %s", BRAND_LOGO_BASE_URL + filename)
+        try:
+            async with timeout(LOGO_DOWNLOAD_TIMEOUT):
+                response = await async_get_clientsession(self._hass).get(
+                    BRAND_LOGO_BASE_URL + filename
+                )
+                response.raise_for_status()
+                return await response.read()
+        except (ClientError, TimeoutError) as err:
+            _LOGGER.warning("Failed to download brand logo %s: %s", filename, err)
+            return None
+
+    def _read(self, filename: str) -> bytes | None:
+        """Read a logo from the disk cache."""
+        try:
+            return (self._directory / filename).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, filename: str, body: bytes) -> None:
+        """Write a logo to the disk cache."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        (self._directory / filename).write_bytes(body)
+
+
+class BrandLogoView(HomeAssistantView):
+    """Serve brand logos used as entity pictures."""
+
+    url = BRAND_LOGOS_URL_PATH + "/{filename}"
+    name = f"api:{DOMAIN}:logos"
+    # entity pictures are loaded by the browser without authentication
+    requires_auth = False
+
+    def __init__(self, cache: BrandLogoCache) -> None:
+        """Init view."""
+        self._cache = cache
+
+    async def get(self, request: web.Request, filename: str) -> web.Response:
+        """Return a logo, or 304 if the client already has it."""
+        if filename not in BRAND_LOGO_FILES:
+            raise web.HTTPNotFound
+        if (logo := await self._cache.async_get(filename)) is None:
+            raise web.HTTPServiceUnavailable
+        body, etag = logo
+
+        headers = {
+            hdrs.ETAG: etag,
+            hdrs.CACHE_CONTROL: f"public, max-age={LOGO_MAX_AGE}",
+        }
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH, "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=body,
+            content_type=mimetypes.guess_type(filename)[0],
+            headers=headers,
+        )
+
+
+def async_setup_logo_view(hass: HomeAssistant) -> None:
+    """Register the logos view once, the cache is shared by config entries."""
+    if DATA_LOGO_CACHE in hass.data:
+        return
+    hass.data[DATA_LOGO_CACHE] = cache = BrandLogoCache(hass)
+    hass.http.register_view(BrandLogoView(cache))
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Opendatasoft explore v2.1 records API.
+
+Implements the subset of the prix-des-carburants records API used by
+PrixCarburantTool:
+
+- `select`, `order_by`, and `offset`/`limit` with the 100 rows cap and the
+  offset window, answered with `total_count`;
+- `where` with `id IN (...)`, `id=...`, `field="value"`, `field IS [NOT] NULL`,
+  `distance(geom, ...)` and `in_bbox(geom, ...)`, combined with `AND`/`NOT`;
+- aggregates (`avg`, `min`, `max`, `count`, `sum`, with an `as` alias) grouped
+  by the `group_by` fields;
+- the JSONL bulk export (`exports/jsonl`) of the whole dataset, with `select`
+  and `where`.
+
+Request and transfer counters are exposed on `/_standin/counters` and reset
+by a POST on `/_standin/reset`, for a server running in another process.
+
+Data comes from a synthetic dataset or a recorded one (JSON list or JSONL export).
+Latency and error rate can be injected to reproduce a slow or flaky API.
+
+Usage from tests or benchmarks:
+
+    server = PrixCarburantStandIn(generate_dataset(1000))
+    records_url = await server.start()
+    with patch.object(tools, "PRIX_CARBURANT_API_URL", records_url):
+        ...
+    await server.stop()
+
+Usage from the command line:
+
+    python -m scripts.api_standin --stations 1000 --port 8080 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from math import atan2, cos, pi, radians, sin, sqrt
+from pathlib import Path
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+RECORDS_PATH = "/api/explore/v2.1/catalog/datasets/prix-des-carburants-en-france-flux-instantane-v2/records"
+EXPORT_PATH = "/api/explore/v2.1/catalog/datasets/prix-des-carburants-en-france-flux-instantane-v2/exports/jsonl"
+# counters of a server running in another process, not counted themselves
+COUNTERS_PATH = "/_standin/counters"
+RESET_PATH = "/_standin/reset"
+# records written to the export stream between two flushes
+EXPORT_BATCH_SIZE = 500
+FUELS = ("gazole", "sp95", "sp98", "e10", "e85", "gplc")
+MAX_LIMIT = 100
+MAX_OFFSET_WINDOW = 10000
+DEFAULT_LIMIT = 10
+# distinct (where, order_by) queries whose matching records are kept
+MATCHES_CACHE_SIZE = 32
+# Bounding box of metropolitan France (south, west, north, east)
+FRANCE_BBOX = (42.3, -4.8, 51.1, 8.2)
+
+_IN_PATTERN = re.compile(r"^(\w+)\s+IN\s*\((.*)\)$", re.IGNORECASE | re.DOTALL)
+_EQUAL_PATTERN = re.compile(r"^(\w+)\s*=\s*(.+)$", re.DOTALL)
+_DISTANCE_PATTERN = re.compile(
+    r"^distance\(\s*geom\s*,\s*geom'POINT\(\s*(-?[\d.]+)\s+(-?[\d.]+)\s*\)'\s*,"
+    r"\s*([\d.]+)\s*(km|m)?\s*\)$",
+    re.IGNORECASE,
+)
+
+_IN_BBOX_PATTERN = re.compile(
+    r"^in_bbox\(\s*geom\s*,\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*,"
+    r"\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*\)$",
+    re.IGNORECASE,
+)
+_NULL_PATTERN = re.compile(r"^(\w+)\s+IS\s+(NOT\s+)?NULL$", re.IGNORECASE)
+_AGGREGATE_PATTERN = re.compile(
+    r"^(avg|min|max|count|sum)\(\s*(\w+)\s*\)(?:\s+as\s+(\w+))?$", re.IGNORECASE
+)
+
+Predicate = Callable[[dict], bool]
+
+
+class WhereSyntaxError(ValueError):
+    """Exception to indicate an unsupported `where` expression."""
+
+
+def _get_distance(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Get distance in km between 2 locations (haversine formula)."""
+    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
+    calcul_a = (
+        sin((lat2 - lat1) / 2) ** 2
+        + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    )
+    return 6371 * 2 * atan2(sqrt(calcul_a), sqrt(1 - calcul_a))
+
+
+def _split_top_level(expression: str, keyword: str) -> list[str]:
+    """Split an expression on a keyword found outside parentheses and quotes."""
+    parts: list[str] = []
+    depth = 0
+    quote: str | None = None
+    start = 0
+    index = 0
+    token = f" {keyword.upper()} "
+    upper_expression = expression.upper()
+    while index < len(expression):
+        char = expression[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and upper_expression.startswith(token, index):
+            parts.append(expression[start:index])
+            index += len(token)
+            start = index
+            continue
+        index += 1
+    parts.append(expression[start:])
+    return parts
+
+
+def _unquote(value: str) -> str:
+    """Remove quotes around an ODSQL literal."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":  # noqa: PLR2004
+        return value[1:-1]
+    return value
+
+
+def _is_wrapped(expression: str) -> bool:
+    """Return True if the whole expression is enclosed in one pair of parentheses."""
+    if not expression.startswith("(") or not expression.endswith(")"):
+        return False
+    depth = 0
+    for index, char in enumerate(expression):
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if depth == 0 and index < len(expression) - 1:
+            return False
+    return True
+
+
+def parse_where(expression: str) -> Predicate:  # noqa: PLR0911
+    """Compile a `where` expression into a predicate on records."""
+    expression = expression.strip()
+    if not expression:
+        return lambda _record: True
+
+    if len(parts := _split_top_level(expression, "AND")) > 1:
+        predicates = [parse_where(part) for part in parts]
+        return lambda record: all(predicate(record) for predicate in predicates)
+
+    if expression.upper().startswith("NOT "):
+        negated = parse_where(expression[4:])
+        return lambda record: not negated(record)
+
+    if _is_wrapped(expression):
+        return parse_where(expression[1:-1])
+
+    if match := _DISTANCE_PATTERN.match(expression):
+        longitude, latitude = float(match[1]), float(match[2])
+        distance = float(match[3]) / (1000 if match[4] == "m" else 1)
+        return lambda record: (
+            _get_distance(
+                longitude, latitude, record["geom"]["lon"], record["geom"]["lat"]
+            )
+            <= distance
+        )
+
+    if match := _IN_BBOX_PATTERN.match(expression):
+        latitude1, longitude1, latitude2, longitude2 = map(float, match.groups())
+        south, north = sorted((latitude1, latitude2))
+        west, east = sorted((longitude1, longitude2))
+        return lambda record: (
+            south <= record["geom"]["lat"] <= north
+            and west <= record["geom"]["lon"] <= east
+        )
+
+    if match := _NULL_PATTERN.match(expression):
+        field, not_null = match[1], bool(match[2])
+        return lambda record: (record.get(field) is not None) == not_null
+
+    if match := _IN_PATTERN.match(expression):
+        field = match[1]
+        values = {_unquote(value) for value in match[2].split(",")}
+        return lambda record: str(record.get(field)) in values
+
+    if match := _EQUAL_PATTERN.match(expression):
+        field = match[1]
+        value = _unquote(match[2])
+        return lambda record: str(record.get(field)) == value
+
+    msg = f"Unsupported where expression: {expression}"
+    raise WhereSyntaxError(msg)
+
+
+def generate_dataset(
+    count: int,
+    seed: int = 0,
+    center: tuple[float, float] | None = None,
+    radius_km: float = 30,
+) -> list[dict]:
+    """
+    Generate synthetic station records.
+
+    Stations are spread over metropolitan France, or within `radius_km` around
+    `center` (latitude, longitude) when given.
+    """
+    generator = random.Random(seed)  # noqa: S311
+    now = datetime.now(tz=UTC).replace(microsecond=0)
+    records: list[dict] = []
+    used_ids: set[int] = set()
+    while len(records) < count:
+        if center:
+            # uniform distribution in the disc (1 degree of latitude ~ 111 km)
+            distance = radius_km * sqrt(generator.random()) / 111
+            angle = generator.uniform(0, 2 * pi)
+            latitude = center[0] + distance * sin(angle)
+            longitude = center[1] + distance * cos(angle) / cos(radians(center[0]))
+        else:
+            latitude = generator.uniform(FRANCE_BBOX[0], FRANCE_BBOX[2])
+            longitude = generator.uniform(FRANCE_BBOX[1], FRANCE_BBOX[3])
+        department = generator.randint(1, 95)
+        postal_code = f"{department:02d}{generator.randint(0, 999):03d}"
+        station_id = int(f"{postal_code}{generator.randint(1, 999):03d}")
+        if station_id in used_ids:
+            continue
+        used_ids.add(station_id)
+
+        record = {
+            "id": station_id,
+            "latitude": str(round(latitude * 100000)),
+            "longitude": str(round(longitude * 100000)),
+            "geom": {"lon": longitude, "lat": latitude},
+            "cp": postal_code,
+            "adresse": f"{generator.randint(1, 200)} route de la station",  # codespell:ignore-words-list=adresse
+            "ville": f"Ville {postal_code}",
+            "code_departement": f"{department:02d}",
+            "departement": f"Département {department:02d}",
+            "code_region": f"{department % 13 + 11}",
+            "region": f"Région {department % 13 + 11}",
+        }
+        for fuel in FUELS:
+            available = generator.random() < 0.7  # noqa: PLR2004
+            updated = now - timedelta(minutes=generator.randint(0, 7 * 24 * 60))
+            record |= {
+                f"{fuel}_prix": round(generator.uniform(1.5, 2.1), 3)
+                if available
+                else None,
+                f"{fuel}_maj": updated.isoformat() if available else None,
+                f"{fuel}_rupture_debut": None,
+                f"{fuel}_rupture_type": None,
+            }
+        records.append(record)
+    return records
+
+
+def aggregate(records: list[dict], select: str, group_by: str) -> list[dict]:
+    """Group records by the group_by fields and compute the selected aggregates."""
+    group_fields = [field.strip() for field in group_by.split(",") if field.strip()]
+    groups: dict[tuple, list[dict]] = {}
+    for record in records:
+        groups.setdefault(
+            tuple(record.get(field) for field in group_fields), []
+        ).append(record)
+
+    results = []
+    for key, group in groups.items():
+        row = dict(zip(group_fields, key, strict=True))
+        for expression in select.split(","):
+            if not (match := _AGGREGATE_PATTERN.match(expression.strip())):
+                continue
+            function, field, alias = match.groups()
+            values = [
+                record[field] for record in group if record.get(field) is not None
+            ]
+            function = function.lower()
+            if function == "count":
+                value = len(values)
+            elif not values:
+                value = None
+            elif function == "avg":
+                value = sum(values) / len(values)
+            else:
+                value = {"min": min, "max": max, "sum": sum}[function](values)
+            row[alias or f"{function}({field})"] = value
+        results.append(row)
+    return results
+
+
+def load_dataset(path: Path) -> list[dict]:
+    """Load recorded station records from a JSON list or a JSONL export."""
+    with path.open(encoding="utf-8") as file:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in file if line.strip()]
+        return json.load(file)
+
+
+def _error(status: int, error_code: str, message: str) -> web.Response:
+    """Build an API error response."""
+    return web.json_response(
+        {"error_code": error_code, "message": message}, status=status
+    )
+
+
+class PrixCarburantStandIn:
+    """Local aiohttp server answering like the prix-carburants records API."""
+
+    def __init__(
+        self,
+        records: list[dict],
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ) -> None:
+        """Init the stand-in server."""
+        self.records = records
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.request_count = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)  # noqa: S311
+        self._runner: web.AppRunner | None = None
+        # matching records by (where, order_by), least recently used first: the
+        # pages of a query reuse its scan, as records do not change while serving
+        self._matches_cache: OrderedDict[tuple[str, str], list[dict]] = OrderedDict()
+        self.url = ""
+
+        self.app = web.Application()
+        self.app.router.add_get(RECORDS_PATH, self._handle_records)
+        self.app.router.add_get(EXPORT_PATH, self._handle_export)
+        self.app.router.add_get(COUNTERS_PATH, self._handle_counters)
+        self.app.router.add_post(RESET_PATH, self._handle_reset)
+
+    @property
+    def records_url(self) -> str:
+        """Return the URL of the records endpoint."""
+        return self.url + RECORDS_PATH
+
+    @property
+    def export_url(self) -> str:
+        """Return the URL of the JSONL export endpoint."""
+        return self.url + EXPORT_PATH
+
+    def reset_counters(self) -> None:
+        """Reset request and transfer counters."""
+        self.request_count = 0
+        self.bytes_sent = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start the server and return the records endpoint URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.records_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _inject_faults(self) -> web.Response | None:
+        """Apply the configured latency and return an error response if drawn."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _error(self.error_status, "ServiceUnavailable", "Injected error")
+        return None
+
+    def _send(self, body: dict) -> web.Response:
+        """Serialize a JSON body and count transferred bytes."""
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.bytes_sent += len(payload)
+        return web.Response(body=payload, content_type="application/json")
+
+    def _get_matches(self, where: str, order_by: str | None) -> list[dict]:
+        """Return the records matching a where clause, sorted by order_by."""
+        cache_key = (where, order_by or "")
+        if (matches := self._matches_cache.get(cache_key)) is not None:
+            self._matches_cache.move_to_end(cache_key)
+            return matches
+
+        predicate = parse_where(where)
+        matches = [record for record in self.records if predicate(record)]
+        if order_by:
+            field, _, direction = order_by.strip().partition(" ")
+            descending = direction.strip().upper() == "DESC"
+            present = [record for record in matches if record.get(field) is not None]
+            missing = [record for record in matches if record.get(field) is None]
+            present.sort(key=lambda record: record[field], reverse=descending)
+            matches = present + missing
+        self._matches_cache[cache_key] = matches
+        if len(self._matches_cache) > MATCHES_CACHE_SIZE:
+            self._matches_cache.popitem(last=False)
+        return matches
+
+    async def _handle_counters(self, _request: web.Request) -> web.Response:
+        """Return the request and transfer counters."""
+        return web.json_response(
+            {"request_count": self.request_count, "bytes_sent": self.bytes_sent}
+        )
+
+    async def _handle_reset(self, _request: web.Request) -> web.Response:
+        """Reset the request and transfer counters."""
+        self.reset_counters()
+        return web.Response(status=204)
+
+    async def _handle_records(self, request: web.Request) -> web.Response:
+        """Answer a records query."""
+        self.request_count += 1
+        if error := await self._inject_faults():
+            return error
+
+        query = request.query
+        try:
+            limit = int(query.get("limit", DEFAULT_LIMIT))
+            offset = int(query.get("offset", 0))
+        except ValueError:
+            return _error(400, "InvalidRESTParameterError", "Invalid offset or limit")
+        if not -1 <= limit <= MAX_LIMIT:
+            return _error(
+                400,
+                "InvalidRESTParameterError",
+                f"Invalid value for limit API parameter: {limit} was found but "
+                f"-1 <= limit <= {MAX_LIMIT} is expected.",
+            )
+        if offset + limit > MAX_OFFSET_WINDOW:
+            return _error(
+                400,
+                "InvalidRESTParameterError",
+                f"Invalid value for offset API parameter: offset + limit should be "
+                f"lower than {MAX_OFFSET_WINDOW}",
+            )
+
+        try:
+            matches = self._get_matches(query.get("where", ""), query.get("order_by"))
+        except WhereSyntaxError as err:
+            return _error(400, "ODSQLError", str(err))
+
+        select = query.get("select")
+        if group_by := query.get("group_by"):
+            matches = aggregate(matches, select or "", group_by)
+        page = matches[offset:] if limit == -1 else matches[offset : offset + limit]
+        if select and not group_by:
+            fields = [field.strip() for field in select.split(",")]
+            page = [{field: record.get(field) for field in fields} for record in page]
+
+        return self._send({"total_count": len(matches), "results": page})
+
+    async def _handle_export(self, request: web.Request) -> web.StreamResponse:
+        """Stream the records matching a query as JSON lines."""
+        self.request_count += 1
+        if error := await self._inject_faults():
+            return error
+
+        query = request.query
+        try:
+            matches = self._get_matches(query.get("where", ""), query.get("order_by"))
+        except WhereSyntaxError as err:
+            return _error(400, "ODSQLError", str(err))
+        fields = (
+            [field.strip() for field in select.split(",")]
+            if (select := query.get("select"))
+            else None
+        )
+
+        response = web.StreamResponse(headers={"Content-Type": "application/jsonl"})
+        await response.prepare(request)
+        for index in range(0, len(matches), EXPORT_BATCH_SIZE):
+            payload = "".join(
+                json.dumps(
+                    record
+                    if fields is None
+                    else {field: record.get(field) for field in fields},
+                    ensure_ascii=False,
+                )
+                + "\n"
+                for record in matches[index : index + EXPORT_BATCH_SIZE]
+            ).encode("utf-8")
+            self.bytes_sent += len(payload)
+            await response.write(payload)
+        await response.write_eof()
+        return response
+
+
+async def _serve(server: PrixCarburantStandIn, host: str, port: int) -> None:
+    """Run the server until cancelled."""
+    records_url = await server.start(host, port)
+    logger.info("Serving %d stations on %s", len(server.records), records_url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Run the stand-in server from the command line."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--dataset", type=Path, help="Recorded JSON/JSONL dataset")
+    parser.add_argument("--stations", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    records = (
+        load_dataset(args.dataset)
+        if args.dataset
+        else generate_dataset(args.stations, seed=args.seed)
+    )
+    server = PrixCarburantStandIn(
+        records,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(_serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+
+
+if __name__ == "__main__":
+    main()
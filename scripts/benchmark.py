@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Benchmark PrixCarburantTool against the local records API stand-in.
+
+Runs the setup sequence of the integration (names initialization, discovery,
+manual stations, first prices refresh), the remote station names refresh
+run after it, and each hot path on its own, for
+synthetic station sets of increasing size. For each run, it records wall time,
+event loop block time, peak memory, request count and bytes transferred, and
+writes a JSON report for regression tracking.
+
+The API stand-in runs in a separate process, so that its event loop and its
+allocations are not counted in the loop block time and peak memory of the tool
+(tracemalloc traces every thread of a process).
+
+Requires the development environment (requirements.txt) to import the tool:
+
+    python -m scripts.benchmark --sizes 100 1000 10000 --output report.json
+"""
+
+import argparse
+import asyncio
+import bz2
+import json
+import logging
+import multiprocessing
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from contextlib import ExitStack
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+from unittest.mock import patch
+
+from aiohttp import ClientSession, web
+
+from custom_components.prix_carburant import tools
+from scripts.api_standin import (
+    COUNTERS_PATH,
+    EXPORT_PATH,
+    RECORDS_PATH,
+    RESET_PATH,
+    PrixCarburantStandIn,
+    generate_dataset,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).parent.parent
+COMPONENT_DIR = REPO_ROOT / "custom_components/prix_carburant"
+REPORT_VERSION = 1
+# Home location used for discovery, stations are generated around it
+HOME_LATITUDE = 48.1113
+HOME_LONGITUDE = -1.6800
+STATIONS_RADIUS_KM = 25
+DISCOVERY_DISTANCE_KM = 30
+MANUAL_STATIONS_COUNT = 5
+LOOP_MONITOR_INTERVAL = 0.005
+STANDIN_START_TIMEOUT = 60
+
+Scenario = Callable[[tools.PrixCarburantTool], Awaitable[None]]
+
+
+class LoopBlockMonitor:
+    """Measure how long the event loop is blocked while running a workload."""
+
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL) -> None:
+        """Init monitor."""
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.total = 0.0
+        self.maximum = 0.0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = loop.time() - start - self._interval
+            if lag > 0:
+                self.total += lag
+                self.maximum = max(self.maximum, lag)
+
+    async def __aenter__(self) -> Self:
+        """Start monitoring."""
+        self._task = asyncio.create_task(self._run())
+        # let the monitor take its first timestamp
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *_args: object) -> None:
+        """Stop monitoring."""
+        if self._task:
+            self._task.cancel()
+
+
+def _add_station_name_routes(server: PrixCarburantStandIn) -> None:
+    """Serve the station name sources from the shipped local files."""
+    osm_csv = (COMPONENT_DIR / tools.STATIONS_NAME_OSM_FILE).read_bytes()
+    osm_body = bz2.compress(osm_csv)
+    custom_body = (COMPONENT_DIR / tools.STATIONS_NAME_FILE).read_bytes()
+
+    async def _osm(_request: web.Request) -> web.Response:
+        server.bytes_sent += len(osm_body)
+        return web.Response(body=osm_body)
+
+    async def _custom(_request: web.Request) -> web.Response:
+        server.bytes_sent += len(custom_body)
+        return web.Response(body=custom_body, content_type="application/json")
+
+    server.app.router.add_get("/stations_name_osm.csv.bz2", _osm)
+    server.app.router.add_get("/stations_name.json", _custom)
+
+
+async def _serve_standin(
+    size: int,
+    seed: int,
+    latency: float,
+    error_rate: float,
+    connection: Connection,
+) -> None:
+    """Serve a synthetic dataset and send the server URL to the parent."""
+    records = generate_dataset(
+        size,
+        seed=seed,
+        center=(HOME_LATITUDE, HOME_LONGITUDE),
+        radius_km=STATIONS_RADIUS_KM,
+    )
+    server = PrixCarburantStandIn(
+        records, latency=latency, error_rate=error_rate, seed=seed
+    )
+    _add_station_name_routes(server)
+    await server.start()
+    connection.send(server.url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def _run_standin(*args: object) -> None:
+    """Run the stand-in server, target of the server process."""
+    asyncio.run(_serve_standin(*args))
+
+
+class StandInProcess:
+    """API stand-in running in a child process, with its counters over HTTP."""
+
+    def __init__(self, size: int, seed: int, latency: float, error_rate: float) -> None:
+        """Init the server process."""
+        context = multiprocessing.get_context("spawn")
+        self._connection, child_connection = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_run_standin,
+            args=(size, seed, latency, error_rate, child_connection),
+            daemon=True,
+        )
+        self.url = ""
+
+    async def start(self) -> None:
+        """Start the process and wait for the server to listen."""
+        self._process.start()
+        if not await asyncio.to_thread(self._connection.poll, STANDIN_START_TIMEOUT):
+            self.stop()
+            msg = "API stand-in did not start"
+            raise TimeoutError(msg)
+        self.url = self._connection.recv()
+
+    def stop(self) -> None:
+        """Stop the process."""
+        self._process.terminate()
+        self._process.join()
+
+    async def reset_counters(self, session: ClientSession) -> None:
+        """Reset the request and transfer counters of the server."""
+        async with session.post(self.url + RESET_PATH) as response:
+            response.raise_for_status()
+
+    async def get_counters(self, session: ClientSession) -> dict:
+        """Return the request and transfer counters of the server."""
+        async with session.get(self.url + COUNTERS_PATH) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+async def _setup(tool: tools.PrixCarburantTool) -> None:
+    """Run the same sequence as the integration async_setup_entry."""
+    await tool.async_initialize()
+    await tool.init_stations_from_location(
+        latitude=HOME_LATITUDE,
+        longitude=HOME_LONGITUDE,
+        distance=DISCOVERY_DISTANCE_KM,
+    )
+    await tool.add_manual_stations(
+        manual_station_ids=list(tool.stations)[:MANUAL_STATIONS_COUNT],
+        latitude=HOME_LATITUDE,
+        longitude=HOME_LONGITUDE,
+    )
+    await tool.update_stations_prices()
+
+
+async def _refresh_station_names(tool: tools.PrixCarburantTool) -> None:
+    await tool.async_refresh_station_names()
+
+
+async def _init_stations_from_location(tool: tools.PrixCarburantTool) -> None:
+    await tool.init_stations_from_location(
+        latitude=HOME_LATITUDE,
+        longitude=HOME_LONGITUDE,
+        distance=DISCOVERY_DISTANCE_KM,
+    )
+
+
+async def _update_stations_prices(tool: tools.PrixCarburantTool) -> None:
+    await tool.update_stations_prices()
+
+
+async def _find_nearest_station(tool: tools.PrixCarburantTool) -> None:
+    await tool.find_nearest_station(
+        longitude=HOME_LONGITUDE, latitude=HOME_LATITUDE, fuel="Gazole", distance=10
+    )
+
+
+# scenario name -> (workload, needs discovered stations before measuring)
+SCENARIOS: dict[str, tuple[Scenario, bool]] = {
+    "setup": (_setup, False),
+    "refresh_station_names": (_refresh_station_names, True),
+    "init_stations_from_location": (_init_stations_from_location, False),
+    "update_stations_prices": (_update_stations_prices, True),
+    "find_nearest_station": (_find_nearest_station, False),
+}
+
+
+async def _measure(
+    server: StandInProcess,
+    session: ClientSession,
+    scenario: str,
+    snapshot_mode: bool,  # noqa: FBT001
+) -> dict:
+    """Run one scenario once and return its measurements."""
+    workload, needs_stations = SCENARIOS[scenario]
+    tool = tools.PrixCarburantTool(
+        request_timeout=60, session=session, snapshot_mode=snapshot_mode
+    )
+    if needs_stations:
+        await _init_stations_from_location(tool)
+
+    await server.reset_counters(session)
+    tracemalloc.reset_peak()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    async with LoopBlockMonitor() as monitor:
+        start = time.perf_counter()
+        await workload(tool)
+        wall_time = time.perf_counter() - start
+    peak_memory = tracemalloc.get_traced_memory()[1] - memory_before
+    counters = await server.get_counters(session)
+    return {
+        "wall_time_s": wall_time,
+        "loop_block_total_s": monitor.total,
+        "loop_block_max_s": monitor.maximum,
+        "peak_memory_bytes": peak_memory,
+        "requests": counters["request_count"],
+        "bytes_transferred": counters["bytes_sent"],
+        "stations": len(tool.stations),
+    }
+
+
+async def run_benchmarks(args: argparse.Namespace) -> list[dict]:
+    """Run every scenario for every dataset size."""
+    results = []
+    for size in args.sizes:
+        server = StandInProcess(size, args.seed, args.latency, args.error_rate)
+        await server.start()
+
+        with ExitStack() as stack:
+            stack.callback(server.stop)
+            for constant, url in (
+                ("PRIX_CARBURANT_API_URL", server.url + RECORDS_PATH),
+                ("PRIX_CARBURANT_EXPORT_URL", server.url + EXPORT_PATH),
+                ("STATIONS_NAME_OSM_URL", f"{server.url}/stations_name_osm.csv.bz2"),
+                ("STATIONS_NAME_URL", f"{server.url}/stations_name.json"),
+            ):
+                stack.enter_context(patch.object(tools, constant, url))
+
+            async with ClientSession() as session:
+                for scenario in args.scenarios:
+                    runs = [
+                        await _measure(server, session, scenario, args.snapshot)
+                        for _ in range(args.repeat)
+                    ]
+                    result = {
+                        "scenario": scenario,
+                        "dataset_size": size,
+                        "runs": args.repeat,
+                        **{
+                            key: statistics.median(run[key] for run in runs)
+                            for key in runs[0]
+                        },
+                    }
+                    logger.info(
+                        "%-28s %6d stations: %8.3fs wall, %7.3fs loop blocked, "
+                        "%6d requests, %10d bytes",
+                        scenario,
+                        size,
+                        result["wall_time_s"],
+                        result["loop_block_total_s"],
+                        result["requests"],
+                        result["bytes_transferred"],
+                    )
+                    results.append(result)
+    return results
+
+
+def _git_revision() -> str:
+    """Return the current git revision, or an empty string."""
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],  # noqa: S607
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        check=False,
+    )
+    return result.stdout.strip()
+
+
+def main() -> None:
+    """Run the benchmark suite and write the report."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--snapshot", action="store_true", help="Run the tool in snapshot mode"
+    )
+    parser.add_argument("--output", type=Path, help="JSON report path")
+    args = parser.parse_args()
+
+    # keep the tool quiet, its warnings are expected with injected errors
+    logging.getLogger(tools.__name__).setLevel(logging.ERROR)
+    tracemalloc.start()
+    results = asyncio.run(run_benchmarks(args))
+    tracemalloc.stop()
+
+    report = {
+        "version": REPORT_VERSION,
+        "date": datetime.now(tz=UTC).isoformat(),
+        "revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {
+            "latency_s": args.latency,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "snapshot_mode": args.snapshot,
+            "discovery_distance_km": DISCOVERY_DISTANCE_KM,
+        },
+        "results": results,
+    }
+    if args.output:
+        with args.output.open("w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+        logger.info("Report written to %s", args.output)
+    else:
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Build the stations name index shipped with the integration.
+
+Merges stations_name_osm.csv and stations_name.json into stations_name.db,
+the SQLite index read by the integration when the remote sources are not
+available. The index is rebuilt from scratch; the sources hashes are stored
+in its metadata so an outdated index can be detected with --check.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import logging
+import sys
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+COMPONENT_DIR = Path(__file__).parent.parent / "custom_components/prix_carburant"
+STATIONS_OSM_CSV = COMPONENT_DIR / "stations_name_osm.csv"
+STATIONS_JSON = COMPONENT_DIR / "stations_name.json"
+
+# load the module by path: the integration package imports Home Assistant
+_spec = importlib.util.spec_from_file_location(
+    "stations_index", COMPONENT_DIR / "stations_index.py"
+)
+stations_index = importlib.util.module_from_spec(_spec)  # type: ignore[arg-type]
+_spec.loader.exec_module(stations_index)  # type: ignore[union-attr]
+
+OUTPUT_FILE = COMPONENT_DIR / stations_index.STATIONS_INDEX_FILE
+
+
+def get_sources_metadata() -> dict[str, str]:
+    """Return the hashes of the index sources."""
+    return {
+        "osm_sha256": hashlib.sha256(STATIONS_OSM_CSV.read_bytes()).hexdigest(),
+        "custom_sha256": hashlib.sha256(STATIONS_JSON.read_bytes()).hexdigest(),
+    }
+
+
+def check_index(path: Path) -> bool:
+    """Return True if the index exists and was built from the current sources."""
+    try:
+        index = stations_index.StationsNameIndex(path)
+    except stations_index.StationsIndexError:
+        logger.exception("Invalid index")
+        return False
+    metadata = index.metadata
+    index.close()
+    return all(
+        metadata.get(key) == value for key, value in get_sources_metadata().items()
+    )
+
+
+def main() -> None:
+    """Build or check the stations name index."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check that the index is up to date with its sources",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        if not check_index(args.output):
+            logger.error("%s is outdated, run %s", args.output, Path(__file__).name)
+            sys.exit(1)
+        logger.info("%s is up to date", args.output)
+        return
+
+    with STATIONS_OSM_CSV.open(newline="", encoding="utf-8") as file:
+        osm_stations = stations_index.parse_stations_csv(file)
+    with STATIONS_JSON.open(encoding="utf-8") as file:
+        custom_stations = json.load(file)
+
+    # build next to the output and replace it once complete
+    temporary_file = args.output.with_name(args.output.name + ".tmp")
+    stations_index.build_stations_index(
+        temporary_file, osm_stations, custom_stations, get_sources_metadata()
+    )
+    temporary_file.replace(args.output)
+    logger.info(
+        "Written %d OSM and %d custom stations to %s (%d bytes)",
+        len(osm_stations),
+        len(custom_stations),
+        args.output,
+        args.output.stat().st_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
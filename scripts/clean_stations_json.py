@@ -20,6 +20,7 @@ import re
 import subprocess
 import sys
 from pathlib import Path
+from typing import Self
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
@@ -52,37 +53,84 @@ def get_all_commits_for_file(filepath: str) -> list[tuple[str, str]]:
     return commits
 
 
-def get_json_at_commit(commit_hash: str, filepath: str) -> dict:
-    """Return parsed JSON content of filepath at a given commit, or {} on error."""
-    result = subprocess.run(  # noqa: S603
-        ["git", "show", f"{commit_hash}:{filepath}"],  # noqa: S607
-        capture_output=True,
-        text=True,
-        cwd=REPO_ROOT,
-        check=False,
-    )
-    if result.returncode != 0:
-        return {}
-    try:
-        return json.loads(result.stdout)
-    except json.JSONDecodeError:
-        return {}
-
-
-def get_ids_changed_in_commit(commit_hash: str, filepath: str) -> set[str]:
+class GitHistoryReader:
     """
-    Return station IDs whose data changed between a commit's parent and itself.
+    Read file versions from git history through one `git cat-file --batch` process.
 
-    Compares full JSON content so name/brand-only edits are detected, not just
-    additions of new station keys.
+    Parsed JSON versions are cached by blob hash, so a version shared by
+    consecutive commits (the child of one is the parent of the next) is read
+    and parsed only once.
     """
-    parent_data = get_json_at_commit(f"{commit_hash}^", filepath)
-    current_data = get_json_at_commit(commit_hash, filepath)
-    changed: set[str] = set()
-    for sid in set(parent_data) | set(current_data):
-        if parent_data.get(sid) != current_data.get(sid):
-            changed.add(sid)
-    return changed
+
+    def __init__(self) -> None:
+        """Start the git cat-file process."""
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],  # noqa: S607
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=REPO_ROOT,
+        )
+        self._json_by_blob: dict[str, dict] = {}
+
+    def __enter__(self) -> Self:
+        """Return the reader."""
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        """Stop the git cat-file process."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop the git cat-file process."""
+        self._process.stdin.close()  # type: ignore[union-attr]
+        self._process.wait()
+
+    def _read_object(self, revision: str) -> tuple[str, bytes] | None:
+        """Return (blob hash, content) of `<commit>:<path>`, None if missing."""
+        stdin, stdout = self._process.stdin, self._process.stdout
+        stdin.write(revision.encode() + b"\n")  # type: ignore[union-attr]
+        stdin.flush()  # type: ignore[union-attr]
+        # "<hash> <type> <size>" or "<revision> missing"
+        header = stdout.readline().decode().split()  # type: ignore[union-attr]
+        if len(header) != 3:  # noqa: PLR2004
+            return None
+        content = stdout.read(int(header[2]))  # type: ignore[union-attr]
+        stdout.read(1)  # type: ignore[union-attr] # trailing newline
+        return header[0], content
+
+    def get_blob_and_json(self, revision: str) -> tuple[str | None, dict]:
+        """Return blob hash and parsed JSON of `<commit>:<path>`, {} on error."""
+        if (result := self._read_object(revision)) is None:
+            return None, {}
+        blob_hash, content = result
+        if (data := self._json_by_blob.get(blob_hash)) is None:
+            try:
+                data = json.loads(content)
+            except json.JSONDecodeError:
+                data = {}
+            self._json_by_blob[blob_hash] = data
+        return blob_hash, data
+
+    def get_json_at_commit(self, commit_hash: str, filepath: str) -> dict:
+        """Return parsed JSON content of filepath at a given commit, or {} on error."""
+        return self.get_blob_and_json(f"{commit_hash}:{filepath}")[1]
+
+    def get_ids_changed_in_commit(self, commit_hash: str, filepath: str) -> set[str]:
+        """
+        Return station IDs whose data changed between a commit's parent and itself.
+
+        Compares full JSON content so name/brand-only edits are detected, not just
+        additions of new station keys.
+        """
+        parent_blob, parent_data = self.get_blob_and_json(f"{commit_hash}^:{filepath}")
+        current_blob, current_data = self.get_blob_and_json(f"{commit_hash}:{filepath}")
+        if parent_blob is not None and parent_blob == current_blob:
+            return set()
+        changed: set[str] = set()
+        for sid in set(parent_data) | set(current_data):
+            if parent_data.get(sid) != current_data.get(sid):
+                changed.add(sid)
+        return changed
 
 
 def get_osm_station_ids(csv_path: Path) -> dict[str, dict]:
@@ -122,16 +170,17 @@ def main() -> None:
     bulk_count = 0
     user_commit_count = 0
 
-    for commit_hash, subject in commits:
-        if AUTOMATED_COMMIT_PATTERN.search(subject):
-            automated_count += 1
-            continue
-        changed_ids = get_ids_changed_in_commit(commit_hash, rel_path)
-        if len(changed_ids) > MAX_BULK_CHANGES:
-            bulk_count += 1
-            continue
-        user_commit_count += 1
-        user_override_ids.update(changed_ids)
+    with GitHistoryReader() as history:
+        for commit_hash, subject in commits:
+            if AUTOMATED_COMMIT_PATTERN.search(subject):
+                automated_count += 1
+                continue
+            changed_ids = history.get_ids_changed_in_commit(commit_hash, rel_path)
+            if len(changed_ids) > MAX_BULK_CHANGES:
+                bulk_count += 1
+                continue
+            user_commit_count += 1
+            user_override_ids.update(changed_ids)
 
     logger.info(
         "Automated commits: %d, Bulk commits (>%d changes): %d, Targeted user commits: %d",
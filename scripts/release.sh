@@ -15,5 +15,8 @@ MANIFEST=${CUSTOM_COMPONENT}/manifest.json
 echo "Setting version to ${1} in ${MANIFEST}"
 cat <<<$(jq ".version=\"${1}\"" "${MANIFEST}") >"${MANIFEST}"
 
+echo "Building stations name index"
+python3 "${ROOT}/scripts/build_stations_index.py"
+
 echo "Creating release zip"
 cd "${CUSTOM_COMPONENT}" && zip "${ROOT}/release.zip" -r ./
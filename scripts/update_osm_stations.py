@@ -1,11 +1,13 @@
 """Download, decompress, and strip unused columns from the OSM stations CSV."""
 
+import argparse
 import bz2
 import csv
-import io
 import logging
 import sys
+from contextlib import ExitStack
 from pathlib import Path
+from typing import IO
 from urllib.request import urlopen
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -21,31 +23,63 @@ OUTPUT_FILE = (
 KEEP_COLUMNS = {"ref:FR:prix-carburants", "name", "brand", "operator", "branch"}
 
 
-def main() -> None:
-    """Download and filter the OSM stations CSV."""
-    logger.info("Downloading %s ...", OSM_CSV_URL)
-    try:
-        with urlopen(OSM_CSV_URL, timeout=30) as response:  # noqa: S310
-            raw = response.read()
-    except OSError:
-        logger.exception("Failed to download OSM CSV")
-        sys.exit(1)
+def filter_csv(source: IO[bytes], output: IO[str]) -> int:
+    """
+    Stream a bz2 compressed CSV to output, keeping only KEEP_COLUMNS.
 
-    content = bz2.decompress(raw).decode("utf-8")
-    reader = csv.DictReader(io.StringIO(content))
-    if reader.fieldnames is None:
-        logger.error("CSV has no header row")
-        sys.exit(1)
-    cols = [c for c in reader.fieldnames if c in KEEP_COLUMNS]
+    Decompression, parsing and writing are done row by row, so memory use does
+    not depend on the input size. Return the number of rows written.
+    """
+    with bz2.open(source, "rt", encoding="utf-8", newline="") as text:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            msg = "CSV has no header row"
+            raise ValueError(msg)
+        indexes = [
+            index for index, column in enumerate(header) if column in KEEP_COLUMNS
+        ]
+        writer = csv.writer(output, lineterminator="\r\n")
+        writer.writerow([header[index] for index in indexes])
+        count = 0
+        for row in reader:
+            writer.writerow(
+                [row[index] if index < len(row) else "" for index in indexes]
+            )
+            count += 1
+    return count
 
-    rows = [{k: row[k] for k in cols} for row in reader]
 
-    with OUTPUT_FILE.open("w", encoding="utf-8", newline="\n") as f:
-        writer = csv.DictWriter(f, fieldnames=cols, extrasaction="ignore")
-        writer.writeheader()
-        writer.writerows(rows)
+def main() -> None:
+    """Download (or read) and filter the OSM stations CSV."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--input", type=Path, help="Local bz2 CSV file instead of downloading it"
+    )
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    # write next to the output and replace it once complete
+    temporary_file = args.output.with_name(args.output.name + ".tmp")
+    try:
+        with ExitStack() as stack:
+            if args.input:
+                logger.info("Reading %s ...", args.input)
+                source = stack.enter_context(args.input.open("rb"))
+            else:
+                logger.info("Downloading %s ...", OSM_CSV_URL)
+                source = stack.enter_context(urlopen(OSM_CSV_URL, timeout=30))
+            output = stack.enter_context(
+                temporary_file.open("w", encoding="utf-8", newline="")
+            )
+            count = filter_csv(source, output)
+    except OSError, EOFError, ValueError, csv.Error:
+        logger.exception("Failed to process OSM CSV")
+        temporary_file.unlink(missing_ok=True)
+        sys.exit(1)
 
-    logger.info("Written %d rows to %s", len(rows), OUTPUT_FILE)
+    temporary_file.replace(args.output)
+    logger.info("Written %d rows to %s", count, args.output)
 
 
 if __name__ == "__main__":
@@ -1,89 +1,246 @@
 #!/usr/bin/env python3
-"""Validate the stations_name.json file."""
+"""
+Validate the stations_name.json file.
 
+Entries are decoded one by one, so every error is reported with its line
+number instead of stopping at the first one, and duplicated station IDs
+(silently collapsed by json.load) are detected. Entries identical to the
+OSM CSV data are reported as warnings: they are redundant overrides.
+"""
+
+import argparse
+import importlib.util
 import json
 import logging
+import re
 import sys
+import time
+from bisect import bisect_right
+from json.decoder import scanstring
 from pathlib import Path
 
 _LOGGER = logging.getLogger(__name__)
 
+COMPONENT_DIR = Path(__file__).parent.parent / "custom_components/prix_carburant"
+DEFAULT_OSM_CSV = COMPONENT_DIR / "stations_name_osm.csv"
+# seconds allowed to validate the file, to catch performance regressions
+DEFAULT_TIME_BUDGET = 10.0
+
+# load the module by path: the integration package imports Home Assistant
+_spec = importlib.util.spec_from_file_location(
+    "stations_index", COMPONENT_DIR / "stations_index.py"
+)
+stations_index = importlib.util.module_from_spec(_spec)  # type: ignore[arg-type]
+_spec.loader.exec_module(stations_index)  # type: ignore[union-attr]
+
+_WHITESPACE = re.compile(r"\s*")
+# start of the next "station_id": entry, to resume after a syntax error
+_ENTRY_START = re.compile(r'^\s*"[^"\n]*"\s*:', re.MULTILINE)
+
+
+class _Report:
+    """Errors and warnings found in the file, with their line numbers."""
+
+    def __init__(self, text: str) -> None:
+        self._line_starts = [0, *(match.end() for match in re.finditer("\n", text))]
+        self.errors: list[tuple[int, str]] = []
+        self.warnings: list[tuple[int, str]] = []
+
+    def line(self, position: int) -> int:
+        """Return the line number of a position in the text."""
+        return bisect_right(self._line_starts, position)
+
+    def error(self, position: int, message: str) -> None:
+        self.errors.append((self.line(position), message))
 
-def _validate_station_entry(station_id: str, station_data: dict) -> str | None:
-    """Validate a single station entry. Returns error message or None."""
-    checks: list[tuple[bool, str]] = [
-        (isinstance(station_id, str), f"Station ID {station_id} should be a string."),
-        (
-            isinstance(station_data, dict),
-            f"Station data for {station_id} should be a dictionary.",
-        ),
-        (
-            "name" in station_data,
-            f"Station {station_id} is missing the 'name' property.",
-        ),
-        (
-            "brand" in station_data,
-            f"Station {station_id} is missing the 'brand' property.",
-        ),
-        (
-            isinstance(station_data.get("name"), str),
-            f"Station {station_id} 'name' should be a string.",
-        ),
-        (
-            isinstance(station_data.get("brand"), str),
-            f"Station {station_id} 'brand' should be a string.",
-        ),
-    ]
-    for passed, message in checks:
-        if not passed:
-            return message
+    def warning(self, position: int, message: str) -> None:
+        self.warnings.append((self.line(position), message))
+
+
+def _validate_station_entry(station_id: str, station_data: object) -> list[str]:
+    """Validate a single station entry. Returns error messages."""
+    errors = []
+    if not station_id.isdigit():
+        errors.append(f"Station ID {station_id} should only contain digits.")
+    if not isinstance(station_data, dict):
+        return [*errors, f"Station data for {station_id} should be a dictionary."]
+
+    for key in ("name", "brand"):
+        if key not in station_data:
+            errors.append(f"Station {station_id} is missing the '{key}' property.")
+        elif not isinstance(station_data[key], str):
+            errors.append(f"Station {station_id} '{key}' should be a string.")
 
     for coord_key in ("latitude", "longitude"):
         if coord_key in station_data:
             try:
                 float(station_data[coord_key])
             except TypeError, ValueError:
-                return f"Station {station_id} '{coord_key}' should be a float."
-    return None
+                errors.append(f"Station {station_id} '{coord_key}' should be a float.")
+    return errors
 
 
-def validate_stations_json(file_path: Path) -> bool | None:
-    """Validate the stations_name.json file."""
-    try:
-        with file_path.open(encoding="UTF-8") as file:
-            data = json.load(file)
+def _load_osm_stations(csv_path: Path) -> dict[str, dict]:
+    """Return dict of station_id -> {name, brand} from OSM CSV, as the index."""
+    with csv_path.open(newline="", encoding="utf-8") as file:
+        return stations_index.parse_stations_csv(file)
 
-        if not isinstance(data, dict):
-            _LOGGER.error("The JSON file should contain a dictionary.")
-            return False
 
-        for station_id, station_data in data.items():
-            if error := _validate_station_entry(station_id, station_data):
-                _LOGGER.error(error)
-                return False
+def _expect(text: str, position: int, expected: str, message: str) -> int:
+    """Return the position after the expected character, raise if missing."""
+    if not text.startswith(expected, position):
+        raise json.JSONDecodeError(message, text, position)
+    return position + len(expected)
 
-    except json.JSONDecodeError:
-        _LOGGER.exception("Invalid JSON format")
-        return False
+
+def _decode_entries(text: str, report: _Report) -> dict[str, tuple[int, object]]:
+    """
+    Decode the top-level object entry by entry.
+
+    Return station_id -> (position, data) of the first definition of each ID.
+    After a syntax error, decoding resumes at the next line starting an entry.
+    """
+    duplicate_keys: list[str] = []
+
+    def _object_pairs_hook(pairs: list[tuple[str, object]]) -> dict:
+        keys = [key for key, _value in pairs]
+        duplicate_keys.extend(key for key in dict.fromkeys(keys) if keys.count(key) > 1)
+        return dict(pairs)
+
+    decoder = json.JSONDecoder(object_pairs_hook=_object_pairs_hook)
+    entries: dict[str, tuple[int, object]] = {}
+    position = _WHITESPACE.match(text).end()  # type: ignore[union-attr]
+    if not text.startswith("{", position):
+        report.error(position, "The JSON file should contain a dictionary.")
+        return entries
+    position += 1
+    comma_position: int | None = None
+
+    while True:
+        position = _WHITESPACE.match(text, position).end()  # type: ignore[union-attr]
+        if text.startswith("}", position):
+            if comma_position is not None:
+                report.error(comma_position, "Invalid JSON: Trailing comma")
+            break
+        comma_position = None
+        entry_start = position
+        try:
+            position = _expect(text, position, '"', "Expecting a quoted station ID")
+            station_id, position = scanstring(text, position)
+            position = _WHITESPACE.match(text, position).end()  # type: ignore[union-attr]
+            position = _expect(text, position, ":", "Expecting ':' delimiter")
+            position = _WHITESPACE.match(text, position).end()  # type: ignore[union-attr]
+            duplicate_keys.clear()
+            station_data, position = decoder.raw_decode(text, position)
+        except json.JSONDecodeError as err:
+            report.error(err.pos, f"Invalid JSON: {err.msg}")
+            # resume at the next entry, after the line of the error
+            next_line = text.find("\n", err.pos)
+            match = _ENTRY_START.search(text, next_line) if next_line != -1 else None
+            if match is None:
+                return entries
+            position = match.start()
+            continue
+
+        for key in duplicate_keys:
+            report.error(
+                entry_start, f"Station {station_id} has a duplicate '{key}' property."
+            )
+        if (first := entries.get(station_id)) is not None:
+            report.error(
+                entry_start,
+                f"Duplicate station ID {station_id}, "
+                f"first defined line {report.line(first[0])}.",
+            )
+        else:
+            entries[station_id] = (entry_start, station_data)
+
+        position = _WHITESPACE.match(text, position).end()  # type: ignore[union-attr]
+        if text.startswith(",", position):
+            comma_position = position
+            position += 1
+        elif not text.startswith("}", position):
+            report.error(position, "Invalid JSON: Expecting ',' delimiter")
+
+    position = _WHITESPACE.match(text, position + 1).end()  # type: ignore[union-attr]
+    if position != len(text):
+        report.error(position, "Invalid JSON: Extra data after the dictionary")
+    return entries
+
+
+def validate_stations_json(
+    file_path: Path,
+    osm_csv_path: Path = DEFAULT_OSM_CSV,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+) -> bool:
+    """Validate the stations_name.json file, logging every error found."""
+    start = time.perf_counter()
+    try:
+        text = file_path.read_text(encoding="UTF-8")
+        osm_stations = _load_osm_stations(osm_csv_path) if osm_csv_path else {}
     except OSError:
         _LOGGER.exception("Error reading file")
         return False
-    else:
-        _LOGGER.info("The stations_name.json file is valid.")
-        return True
+
+    report = _Report(text)
+    entries = _decode_entries(text, report)
+    for station_id, (position, station_data) in entries.items():
+        for error in _validate_station_entry(station_id, station_data):
+            report.error(position, error)
+        osm_data = osm_stations.get(station_id)
+        if osm_data and isinstance(station_data, dict) and station_data == osm_data:
+            report.warning(
+                position,
+                f"Station {station_id} is identical to the OSM data and can be "
+                "removed.",
+            )
+
+    for line, message in sorted(report.warnings):
+        _LOGGER.warning("%s:%s: %s", file_path, line, message)
+    for line, message in sorted(report.errors):
+        _LOGGER.error("%s:%s: %s", file_path, line, message)
+
+    duration = time.perf_counter() - start
+    if duration > time_budget:
+        _LOGGER.error(
+            "Validation took %.2fs, more than the %.2fs budget.", duration, time_budget
+        )
+        return False
+    if report.errors:
+        _LOGGER.error(
+            "%s error(s) in %s entries of %s.",
+            len(report.errors),
+            len(entries),
+            file_path,
+        )
+        return False
+    _LOGGER.info(
+        "The stations_name.json file is valid (%s entries, %.2fs).",
+        len(entries),
+        duration,
+    )
+    return True
 
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
-    if len(sys.argv) != 2:
-        _LOGGER.info("Usage: python validate_stations.py <path_to_stations_name.json>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("file_path", type=Path, help="Path to stations_name.json")
+    parser.add_argument(
+        "--osm-csv",
+        type=Path,
+        default=DEFAULT_OSM_CSV,
+        help="OSM CSV to cross-check entries against",
+    )
+    parser.add_argument(
+        "--time-budget", type=float, default=DEFAULT_TIME_BUDGET, help="Seconds"
+    )
+    args = parser.parse_args()
 
-    file_path = Path(sys.argv[1])
-    if not file_path.exists():
-        _LOGGER.error("File %s does not exist.", file_path)
+    if not args.file_path.exists():
+        _LOGGER.error("File %s does not exist.", args.file_path)
         sys.exit(1)
 
-    if not validate_stations_json(file_path):
+    if not validate_stations_json(args.file_path, args.osm_csv, args.time_budget):
         sys.exit(1)